@@ -18,6 +18,12 @@ class Settings:
     MODEL_CACHE_TTL: int = int(os.getenv("MODEL_CACHE_TTL", "3600"))
     RETRAIN_INTERVAL_HOURS: int = int(os.getenv("RETRAIN_INTERVAL_HOURS", "24"))
     
+    # Training Parallelism Settings
+    TRAIN_N_WORKERS: int = int(os.getenv("TRAIN_N_WORKERS", str(os.cpu_count() or 1)))
+    TRAIN_THREADS_PER_WORKER: int = int(os.getenv("TRAIN_THREADS_PER_WORKER", "1"))
+    TRAIN_CV_FOLDS: int = int(os.getenv("TRAIN_CV_FOLDS", "5"))
+    TUNING_HALVING_FACTOR: int = int(os.getenv("TUNING_HALVING_FACTOR", "3"))
+    
     # Data Settings
     MIN_TRAINING_SAMPLES: int = int(os.getenv("MIN_TRAINING_SAMPLES", "100"))
     FEATURE_WINDOW_DAYS: int = int(os.getenv("FEATURE_WINDOW_DAYS", "30"))
@@ -28,8 +34,70 @@ class Settings:
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
+    # Profiling Settings (opt-in slow-request capture and admin sampling profiler)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    SLOW_REQUEST_THRESHOLD_MS: float = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "500"))
+    SLOW_REQUEST_BUFFER_SIZE: int = int(os.getenv("SLOW_REQUEST_BUFFER_SIZE", "50"))
+    SLOW_REQUEST_MAX_BODY_BYTES: int = int(os.getenv("SLOW_REQUEST_MAX_BODY_BYTES", "65536"))
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    PROFILE_MAX_SECONDS: int = int(os.getenv("PROFILE_MAX_SECONDS", "60"))
+    
     # Model Paths
     MODELS_DIR: str = os.getenv("MODELS_DIR", "./models/saved")
+    PRICE_MODEL_PATH: str = os.getenv("PRICE_MODEL_PATH", os.path.join(MODELS_DIR, "price_predictor.joblib"))
+    ANOMALY_MODEL_PATH: str = os.getenv("ANOMALY_MODEL_PATH", os.path.join(MODELS_DIR, "anomaly_detector.joblib"))
+    
+    # Model Compaction Settings
+    MODEL_COMPACT_ON_SAVE: bool = os.getenv("MODEL_COMPACT_ON_SAVE", "true").lower() == "true"
+    # Pruning is off by default; when enabled, MODEL_PRUNE_FRACTION of the training split is held out to select trees
+    MODEL_PRUNE_TOLERANCE: float = float(os.getenv("MODEL_PRUNE_TOLERANCE", "0"))
+    MODEL_PRUNE_FRACTION: float = float(os.getenv("MODEL_PRUNE_FRACTION", "0.2"))
+    MODEL_PRUNE_MIN_TREES: int = int(os.getenv("MODEL_PRUNE_MIN_TREES", "20"))
+    
+    # Batch Inference Settings (process pool over a shared-memory feature matrix)
+    INFERENCE_N_WORKERS: int = int(os.getenv("INFERENCE_N_WORKERS", str(os.cpu_count() or 1)))
+    INFERENCE_CHUNK_ROWS: int = int(os.getenv("INFERENCE_CHUNK_ROWS", "4096"))
+    INFERENCE_MIN_POOL_ROWS: int = int(os.getenv("INFERENCE_MIN_POOL_ROWS", "20000"))
+    
+    # Model Router Settings (one specialized model per asset type and horizon)
+    ROUTER_MODELS_DIR: str = os.getenv("ROUTER_MODELS_DIR", os.path.join(MODELS_DIR, "router"))
+    ROUTER_CACHE_SIZE: int = int(os.getenv("ROUTER_CACHE_SIZE", "6"))
+    ROUTER_N_ESTIMATORS: int = int(os.getenv("ROUTER_N_ESTIMATORS", "50"))
+    ROUTER_MAX_DEPTH: int = int(os.getenv("ROUTER_MAX_DEPTH", "8"))
+    
+    # Drift Monitoring Settings
+    DRIFT_RESERVOIR_SIZE: int = int(os.getenv("DRIFT_RESERVOIR_SIZE", "1000"))
+    DRIFT_HISTOGRAM_BINS: int = int(os.getenv("DRIFT_HISTOGRAM_BINS", "10"))
+    DRIFT_MIN_SAMPLES: int = int(os.getenv("DRIFT_MIN_SAMPLES", "200"))
+    DRIFT_CHECK_INTERVAL_SECONDS: int = int(os.getenv("DRIFT_CHECK_INTERVAL_SECONDS", "300"))
+    DRIFT_PSI_THRESHOLD: float = float(os.getenv("DRIFT_PSI_THRESHOLD", "0.25"))
+    DRIFT_KS_THRESHOLD: float = float(os.getenv("DRIFT_KS_THRESHOLD", "0.2"))
+    DRIFT_AUTO_RETRAIN: bool = os.getenv("DRIFT_AUTO_RETRAIN", "false").lower() == "true"
+    DRIFT_RETRAIN_WEBHOOK_URL: str = os.getenv("DRIFT_RETRAIN_WEBHOOK_URL", "")
+    DRIFT_RETRAIN_COOLDOWN_MINUTES: int = int(os.getenv("DRIFT_RETRAIN_COOLDOWN_MINUTES", "60"))
+    
+    # Recommendation Settings (BUY/SELL when predicted vs current price differs by more than this)
+    RECOMMENDATION_THRESHOLD_PERCENT: float = float(os.getenv("RECOMMENDATION_THRESHOLD_PERCENT", "5"))
+    
+    # Backtest Settings (window lengths and horizon are in history timesteps)
+    BACKTEST_TRAIN_WINDOW: int = int(os.getenv("BACKTEST_TRAIN_WINDOW", "180"))
+    BACKTEST_TEST_WINDOW: int = int(os.getenv("BACKTEST_TEST_WINDOW", "30"))
+    BACKTEST_HORIZON_STEPS: int = int(os.getenv("BACKTEST_HORIZON_STEPS", "1"))
+    BACKTEST_FEE_BPS: float = float(os.getenv("BACKTEST_FEE_BPS", "30"))
+    BACKTEST_N_ESTIMATORS: int = int(os.getenv("BACKTEST_N_ESTIMATORS", "50"))
+    BACKTEST_MAX_DEPTH: int = int(os.getenv("BACKTEST_MAX_DEPTH", "8"))
+    
+    # AMM Settings (DEXCore trading fee and default slippage cap for max trade size)
+    AMM_FEE_BPS: float = float(os.getenv("AMM_FEE_BPS", "30"))
+    MAX_SLIPPAGE: float = float(os.getenv("MAX_SLIPPAGE", "0.01"))
+    # Upper bounds on a price-impact request; the quote grid is pools x trade sizes
+    AMM_MAX_POOLS: int = int(os.getenv("AMM_MAX_POOLS", "5000"))
+    AMM_MAX_TRADE_SIZES: int = int(os.getenv("AMM_MAX_TRADE_SIZES", "100"))
+    
+    # Risk Scoring: optionally blend AMM slippage of a reference USDC buy into liquidity risk
+    RISK_USE_PRICE_IMPACT: bool = os.getenv("RISK_USE_PRICE_IMPACT", "false").lower() == "true"
+    RISK_REFERENCE_TRADE_SIZE: float = float(os.getenv("RISK_REFERENCE_TRADE_SIZE", "10000"))
+    RISK_MAX_RISK_SLIPPAGE: float = float(os.getenv("RISK_MAX_RISK_SLIPPAGE", "0.05"))
     
     # Risk Scoring Weights
     LIQUIDITY_WEIGHT: float = 0.25
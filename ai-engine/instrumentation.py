@@ -0,0 +1,245 @@
+import asyncio
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypeVar
+import logging
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Stage timings (ms) of the request being handled; None when capture is off
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar('request_stages', default=None)
+
+# Sampler and thread ids serving the request being handled; None when capture is off
+_request_threads: ContextVar[Optional[Tuple['StackSampler', Set[int]]]] = ContextVar('request_threads', default=None)
+
+T = TypeVar('T')
+
+
+@contextmanager
+def stage(name: str):
+    """Time a named stage of the current request (no-op outside a captured request)"""
+    stages = _request_stages.get()
+    if stages is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages[name] = stages.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def _run_sampled(func: Callable[..., T], *args) -> T:
+    """Run func, registering this thread with the current request's stack sampler"""
+    request = _request_threads.get()
+    if request is None:
+        return func(*args)
+    sampler, thread_ids = request
+    thread_id = threading.get_ident()
+    thread_ids.add(thread_id)
+    sampler.enter(thread_id)
+    try:
+        return func(*args)
+    finally:
+        sampler.leave(thread_id)
+
+
+async def run_in_executor(func: Callable[..., T], *args) -> T:
+    """loop.run_in_executor(None, ...) that keeps the request's stage timings and stack samples.
+
+    The executor does not copy context variables, so without this, stages
+    timed in worker threads and their stacks are missing from captures.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, context.run, _run_sampled, func, *args)
+
+
+def collapse_stack(frame) -> str:
+    """Root-to-leaf 'file:function' frames joined with ';' (flamegraph collapsed format)"""
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(frames))
+
+
+def sample_process(seconds: float, interval: float) -> Counter:
+    """Sample every thread's stack for `seconds`; returns collapsed stack -> sample count"""
+    own_thread = threading.get_ident()
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    samples: Counter = Counter()
+
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id != own_thread:
+                samples[f"{thread_names.get(thread_id, thread_id)};{collapse_stack(frame)}"] += 1
+        time.sleep(interval)
+
+    return samples
+
+
+def format_collapsed(samples: Counter) -> str:
+    return '\n'.join(f"{stack} {count}" for stack, count in samples.most_common())
+
+
+class StackSampler:
+    """Background thread sampling request-serving threads while requests are in flight.
+
+    Samples go into a time-bounded ring so a slow request can collect the
+    stacks observed during its own lifetime once it finishes. With async
+    endpoints the serving thread is the event loop, so concurrent requests
+    share its samples; the same goes for executor threads a request hands
+    work to via run_in_executor.
+    """
+
+    def __init__(self, interval: float, max_samples: int):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=max_samples)
+        self._threads: Counter = Counter()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait()
+            with self._lock:
+                targets = list(self._threads)
+                if not targets:
+                    # Cleared under the lock so a concurrent enter() cannot be missed
+                    self._wake.clear()
+                    continue
+
+            frames = sys._current_frames()
+            now = time.perf_counter()
+            for thread_id in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    # Interned so repeated stacks in the ring share one string
+                    self.samples.append((now, thread_id, sys.intern(collapse_stack(frame))))
+            time.sleep(self.interval)
+
+    def enter(self, thread_id: int) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+            self._threads[thread_id] += 1
+            self._wake.set()
+
+    def leave(self, thread_id: int) -> None:
+        with self._lock:
+            self._threads[thread_id] -= 1
+            if self._threads[thread_id] <= 0:
+                del self._threads[thread_id]
+
+    def collect(self, thread_ids: Set[int], started: float, finished: float) -> Dict[str, int]:
+        return dict(Counter(
+            stack for timestamp, sampled_thread, stack in list(self.samples)
+            if sampled_thread in thread_ids and started <= timestamp <= finished
+        ))
+
+
+class SlowRequestLog:
+    """Bounded ring buffer of slow request captures"""
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.captured: deque = deque(maxlen=buffer_size or settings.SLOW_REQUEST_BUFFER_SIZE)
+
+    def append(self, capture: Dict) -> None:
+        self.captured.append(capture)
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent captures first"""
+        captures = list(self.captured)[::-1]
+        return captures[:limit] if limit else captures
+
+
+class SlowRequestMiddleware:
+    """ASGI middleware keeping input, stage timings and stack samples of slow requests.
+
+    Captures go into a SlowRequestLog shared with whoever reads them; the
+    request body is tee'd from `receive` so handlers still read it normally.
+    """
+
+    def __init__(self, app, log: SlowRequestLog, threshold_ms: Optional[float] = None):
+        self.app = app
+        self.log = log
+        self.threshold_ms = settings.SLOW_REQUEST_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        interval = settings.PROFILE_SAMPLE_INTERVAL_MS / 1000
+        # Keep roughly the last minute of samples
+        self.sampler = StackSampler(interval, max_samples=int(60 / interval))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        body = bytearray()
+        status_code = {'value': None}
+
+        async def receive_tee():
+            message = await receive()
+            if message['type'] == 'http.request' and len(body) < settings.SLOW_REQUEST_MAX_BODY_BYTES:
+                body.extend(message.get('body', b''))
+            return message
+
+        async def send_status(message):
+            if message['type'] == 'http.response.start':
+                status_code['value'] = message['status']
+            await send(message)
+
+        stages: Dict[str, float] = {}
+        token = _request_stages.set(stages)
+        thread_id = threading.get_ident()
+        thread_ids = {thread_id}
+        threads_token = _request_threads.set((self.sampler, thread_ids))
+        self.sampler.enter(thread_id)
+        started_at = datetime.now()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive_tee, send_status)
+        finally:
+            finished = time.perf_counter()
+            self.sampler.leave(thread_id)
+            _request_threads.reset(threads_token)
+            _request_stages.reset(token)
+
+            duration_ms = (finished - started) * 1000
+            if duration_ms >= self.threshold_ms:
+                self.log.append(self._capture(
+                    scope, bytes(body), status_code['value'], started_at, duration_ms, stages,
+                    self.sampler.collect(thread_ids, started, finished)
+                ))
+
+    def _capture(self, scope, body: bytes, status_code: Optional[int], started_at: datetime,
+                 duration_ms: float, stages: Dict[str, float], stacks: Dict[str, int]) -> Dict:
+        try:
+            request_input = json.loads(body) if body else None
+        except ValueError:
+            request_input = body[:settings.SLOW_REQUEST_MAX_BODY_BYTES].decode('utf-8', errors='replace')
+
+        logger.warning(f"Slow request {scope['method']} {scope['path']}: {duration_ms:.1f} ms")
+        return {
+            'method': scope['method'],
+            'path': scope['path'],
+            'query_string': scope.get('query_string', b'').decode('latin-1'),
+            'status_code': status_code,
+            'started_at': started_at.isoformat(),
+            'duration_ms': round(duration_ms, 3),
+            'stage_timings_ms': {name: round(value, 3) for name, value in stages.items()},
+            'input': request_input,
+            'stack_samples': stacks
+        }
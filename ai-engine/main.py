@@ -1,18 +1,27 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
-import uvicorn
-from datetime import datetime
+import os
+import time
+from datetime import datetime, timedelta
 import asyncio
+import numpy as np
 
 from models.price_predictor import RWAPricePredictor, RiskScorer, AnomalyDetector
+from models.model_router import ModelRouter, HORIZONS
+from models.drift_monitor import DriftMonitor
+from models.price_impact import quote_grid
+from models.screener import RiskScreener, NUMERIC_COLUMNS
+from models.shared_inference import SharedMemoryInference
+from instrumentation import SlowRequestLog, SlowRequestMiddleware, sample_process, format_collapsed, stage, run_in_executor
 from config import settings
 
 # Configure logging
-logging.basicConfig(level=settings.LOG_LEVEL)
+logging.basicConfig(level=settings.LOG_LEVEL.upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -30,6 +39,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in capture of slow requests (input, stage timings, stack samples)
+slow_requests: Optional[SlowRequestLog] = None
+if settings.PROFILING_ENABLED:
+    slow_requests = SlowRequestLog()
+    app.add_middleware(SlowRequestMiddleware, log=slow_requests)
+
 # Security
 security = HTTPBearer()
 
@@ -45,6 +60,94 @@ def verify_api_key(credentials: HTTPAuthorizationCredentials = Depends(security)
 price_predictor = RWAPricePredictor()
 risk_scorer = RiskScorer()
 anomaly_detector = AnomalyDetector()
+model_router = ModelRouter()
+screener = RiskScreener(risk_scorer)
+batch_inference = SharedMemoryInference()
+
+# Drift monitors for the live prediction and anomaly feature streams
+prediction_drift = DriftMonitor("prediction")
+anomaly_drift = DriftMonitor("anomaly")
+last_retrain_request: Optional[datetime] = None
+
+async def request_retraining(reports: Dict[str, Dict]) -> None:
+    """Ask the training pipeline for a retrain, at most once per cooldown period"""
+    global last_retrain_request
+    
+    cooldown = timedelta(minutes=settings.DRIFT_RETRAIN_COOLDOWN_MINUTES)
+    if last_retrain_request and datetime.now() - last_retrain_request < cooldown:
+        return
+    last_retrain_request = datetime.now()
+    
+    if not settings.DRIFT_RETRAIN_WEBHOOK_URL:
+        logger.warning("Drift threshold crossed but DRIFT_RETRAIN_WEBHOOK_URL is not configured")
+        return
+    
+    try:
+        import httpx
+        
+        async with httpx.AsyncClient(timeout=10) as client:
+            await client.post(settings.DRIFT_RETRAIN_WEBHOOK_URL, json={
+                "reason": "feature_drift",
+                "drifted_features": {name: report["drifted_features"] for name, report in reports.items()},
+                "requested_at": last_retrain_request.isoformat()
+            })
+        logger.info("Retraining requested due to feature drift")
+    except Exception as e:
+        logger.error(f"Error requesting retraining: {str(e)}")
+
+async def drift_check_loop() -> None:
+    """Periodically compare live feature windows with the training snapshots"""
+    while True:
+        await asyncio.sleep(settings.DRIFT_CHECK_INTERVAL_SECONDS)
+        try:
+            reports = {}
+            for monitor in (prediction_drift, anomaly_drift):
+                report = monitor.check()
+                if report and report["drift_detected"]:
+                    reports[monitor.name] = report
+            
+            if reports and settings.DRIFT_AUTO_RETRAIN:
+                await request_retraining(reports)
+        except Exception as e:
+            logger.error(f"Error checking drift: {str(e)}")
+
+# Liveness is reported immediately; readiness waits for saved models to load
+startup_state: Dict[str, Any] = {"ready": False, "models_loaded": [], "error": None}
+
+def load_saved_models() -> None:
+    """Load persisted models from MODELS_DIR (runs in a worker thread)"""
+    saved_models = [
+        ("price_predictor", price_predictor, prediction_drift, settings.PRICE_MODEL_PATH),
+        ("anomaly_detector", anomaly_detector, anomaly_drift, settings.ANOMALY_MODEL_PATH),
+    ]
+    
+    for name, model, monitor, filepath in saved_models:
+        if os.path.exists(filepath):
+            model.load_model(filepath)
+            monitor.set_reference(model.drift_snapshot)
+            startup_state["models_loaded"].append(name)
+    
+    model_router.refresh_routes()
+
+async def load_models_in_background() -> None:
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, load_saved_models)
+    except Exception as e:
+        # The service still answers with heuristics, so a failed load does not block readiness
+        logger.error(f"Error loading saved models: {str(e)}")
+        startup_state["error"] = str(e)
+    finally:
+        startup_state["ready"] = True
+
+@app.on_event("startup")
+async def on_startup():
+    asyncio.create_task(load_models_in_background())
+    asyncio.create_task(drift_check_loop())
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    batch_inference.close()
 
 # Pydantic models
 class AssetData(BaseModel):
@@ -77,6 +180,8 @@ class PredictionResponse(BaseModel):
     price_difference_percent: float
     recommendation: str
     reasoning: str
+    model: str = Field(..., description="router:<asset_type>/<horizon>, general or heuristic")
+    horizon: str
     timestamp: str
 
 class RiskResponse(BaseModel):
@@ -91,6 +196,33 @@ class PortfolioData(BaseModel):
     total_value: float
     user_risk_tolerance: str = Field(default="medium", pattern="^(low|medium|high)$")
 
+class PoolReserves(BaseModel):
+    token_address: str
+    reserve0: float = Field(..., ge=0, description="RWA token reserve")
+    reserve1: float = Field(..., ge=0, description="USDC reserve")
+
+class PriceImpactRequest(BaseModel):
+    pools: List[PoolReserves] = Field(..., min_length=1, max_length=settings.AMM_MAX_POOLS)
+    trade_sizes: List[float] = Field(
+        ..., min_length=1, max_length=settings.AMM_MAX_TRADE_SIZES,
+        description="Input amounts: USDC for buys, RWA tokens for sells"
+    )
+    side: str = Field(default="buy", pattern="^(buy|sell)$")
+    max_slippage: Optional[float] = Field(default=None, gt=0, lt=1)
+    fee_bps: Optional[float] = Field(default=None, ge=0, lt=10000)
+
+class ScreenQuery(BaseModel):
+    asset_types: Optional[List[str]] = None
+    jurisdictions: Optional[List[str]] = None
+    risk_categories: Optional[List[str]] = None
+    min_risk_score: Optional[float] = None
+    max_risk_score: Optional[float] = None
+    min_yield_rate: Optional[float] = Field(default=None, description="Basis points, inclusive")
+    max_yield_rate: Optional[float] = Field(default=None, description="Basis points, inclusive")
+    sort_by: str = Field(default="risk_score", description=f"One of {', '.join(NUMERIC_COLUMNS)}")
+    descending: bool = False
+    limit: int = Field(default=50, gt=0, le=1000)
+
 class MarketInsight(BaseModel):
     insight_type: str
     title: str
@@ -102,37 +234,75 @@ class MarketInsight(BaseModel):
 # Health check
 @app.get("/health")
 async def health_check():
+    """Liveness: the process is up, even while models are still loading"""
     return {
         "status": "healthy",
+        "ready": startup_state["ready"],
         "timestamp": datetime.now().isoformat(),
         "models_trained": price_predictor.is_trained,
         "version": "1.0.0"
     }
 
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness: saved models have finished loading"""
+    body = {
+        "ready": startup_state["ready"],
+        "models_loaded": startup_state["models_loaded"],
+        "error": startup_state["error"],
+        "timestamp": datetime.now().isoformat()
+    }
+    if not startup_state["ready"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=body)
+    return body
+
 # Price prediction endpoint
 @app.post("/api/ai/predict-price", response_model=PredictionResponse)
 async def predict_price(
     asset: AssetData,
+    horizon: Optional[str] = None,
     credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
 ):
-    """Predict fair value for an RWA token"""
+    """Predict fair value for an RWA token (optionally for a 1h/24h/7d horizon, default 24h)"""
+    if horizon is not None and horizon not in HORIZONS:
+        raise HTTPException(status_code=400, detail=f"Unknown horizon. Expected one of {HORIZONS}")
+    
+    # The general model is trained on the 24h target, so only 24h may fall back to it
+    horizon = horizon or "24h"
+    has_route = model_router.has_route(asset.asset_type, horizon)
+    if not has_route and horizon != "24h":
+        raise HTTPException(
+            status_code=404,
+            detail=f"No {horizon} model for asset type {asset.asset_type}. Train with per_asset_models=true"
+        )
+    
     try:
-        if not price_predictor.is_trained:
+        asset_data = asset.dict()
+        if prediction_drift.has_reference:
+            prediction_drift.observe(price_predictor.prepare_features(asset_data))
+        
+        if has_route:
+            # Specialized model for this asset type and horizon
+            predicted_price, confidence = model_router.predict(asset_data, horizon)
+            model_used = f"router:{asset.asset_type}/{horizon}"
+        elif not price_predictor.is_trained:
             # For demo purposes, use a simple heuristic
             predicted_price = asset.current_price * (1 + (asset.yield_rate / 10000))
             confidence = 0.7
+            model_used = "heuristic"
         else:
-            predicted_price, confidence = price_predictor.predict(asset.dict())
+            predicted_price, confidence = price_predictor.predict(asset_data)
+            model_used = "general"
         
         price_diff = predicted_price - asset.current_price
         price_diff_percent = (price_diff / asset.current_price) * 100
         
         # Generate recommendation
-        if price_diff_percent > 5:
+        if price_diff_percent > settings.RECOMMENDATION_THRESHOLD_PERCENT:
             recommendation = "BUY"
             reasoning = f"AI model predicts asset is undervalued by {price_diff_percent:.2f}%. " \
                        f"Factors: yield rate ({asset.yield_rate} bps), liquidity, market conditions."
-        elif price_diff_percent < -5:
+        elif price_diff_percent < -settings.RECOMMENDATION_THRESHOLD_PERCENT:
             recommendation = "SELL"
             reasoning = f"AI model predicts asset is overvalued by {abs(price_diff_percent):.2f}%. " \
                        f"Consider taking profits or reducing exposure."
@@ -149,6 +319,8 @@ async def predict_price(
             price_difference_percent=price_diff_percent,
             recommendation=recommendation,
             reasoning=reasoning,
+            model=model_used,
+            horizon=horizon,
             timestamp=datetime.now().isoformat()
         )
         
@@ -156,6 +328,64 @@ async def predict_price(
         logger.error(f"Error in price prediction: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+def score_batch(predictor: RWAPricePredictor, assets: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(predicted price, confidence, per-tree variance) per asset (runs in a worker thread)"""
+    with stage("prepare_features"):
+        X = np.vstack([predictor.prepare_features(asset_data) for asset_data in assets])
+    
+    with stage("model_predict"):
+        if len(assets) >= settings.INFERENCE_MIN_POOL_ROWS:
+            # Large batches go to the process pool over shared memory
+            results = batch_inference.predict(X)
+            return results["predicted_price"], results["confidence"], results["variance"]
+        return predictor.predict_batch(X, return_variance=True)
+
+# Batch price prediction endpoint
+@app.post("/api/ai/predict-batch")
+async def predict_price_batch(
+    assets: List[AssetData],
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Predict fair values for many tokens at once (universe-wide scoring)"""
+    if not price_predictor.is_trained:
+        raise HTTPException(status_code=503, detail="Price model is not trained yet")
+    
+    try:
+        # Feature building and scoring both run off the event loop
+        predicted, confidence, variance = await run_in_executor(
+            score_batch, price_predictor, [asset.dict() for asset in assets]
+        )
+        current_prices = np.array([asset.current_price for asset in assets])
+        
+        price_diff_percent = (predicted - current_prices) / current_prices * 100
+        threshold = settings.RECOMMENDATION_THRESHOLD_PERCENT
+        recommendations = np.where(
+            price_diff_percent > threshold, "BUY", np.where(price_diff_percent < -threshold, "SELL", "HOLD")
+        )
+        
+        return {
+            "predictions": [
+                {
+                    "token_address": asset.token_address,
+                    "predicted_price": price,
+                    "current_price": asset.current_price,
+                    "confidence_score": score,
+                    "prediction_variance": tree_variance,
+                    "price_difference_percent": diff,
+                    "recommendation": recommendation
+                }
+                for asset, price, score, tree_variance, diff, recommendation in zip(
+                    assets, predicted.tolist(), confidence.tolist(), variance.tolist(),
+                    price_diff_percent.tolist(), recommendations.tolist()
+                )
+            ],
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error in batch price prediction: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
 # Risk scoring endpoint
 @app.post("/api/ai/risk-score", response_model=RiskResponse)
 async def calculate_risk_score(
@@ -164,7 +394,9 @@ async def calculate_risk_score(
 ):
     """Calculate comprehensive risk score for an asset"""
     try:
-        risk_analysis = risk_scorer.calculate_risk_score(asset.dict())
+        asset_data = asset.dict()
+        risk_analysis = risk_scorer.calculate_risk_score(asset_data)
+        screener.record(asset_data, risk_analysis)
         
         # Generate recommendations based on risk level
         recommendations = []
@@ -207,6 +439,47 @@ async def calculate_risk_score(
         logger.error(f"Error in risk calculation: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Risk calculation failed: {str(e)}")
 
+# Screening endpoints
+@app.post("/api/ai/screen/universe")
+async def update_screening_universe(
+    assets: List[AssetData],
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Add or refresh tokens in the screening table; only changed tokens are re-scored"""
+    try:
+        result = screener.upsert([asset.dict() for asset in assets])
+        return {**result, "timestamp": datetime.now().isoformat()}
+        
+    except Exception as e:
+        logger.error(f"Error updating screening universe: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Screening update failed: {str(e)}")
+
+@app.post("/api/ai/screen")
+async def screen_assets(
+    query: ScreenQuery,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Filter, sort and rank tokens by precomputed risk score and asset fields"""
+    if query.sort_by not in NUMERIC_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {query.sort_by}")
+    
+    try:
+        started = time.perf_counter()
+        results = screener.query(**query.dict())
+        query_time_ms = (time.perf_counter() - started) * 1000
+        
+        return {
+            "results": results,
+            "count": len(results),
+            "universe_size": len(screener),
+            "query_time_ms": round(query_time_ms, 4),
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Error screening assets: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Screening failed: {str(e)}")
+
 # Portfolio analysis endpoint
 @app.post("/api/ai/portfolio-analysis")
 async def analyze_portfolio(
@@ -229,11 +502,12 @@ async def analyze_portfolio(
         asset_types = []
         jurisdictions = []
         
-        for asset in portfolio.assets:
-            risk_data = risk_scorer.calculate_risk_score(asset.dict())
-            risk_scores.append(risk_data['overall_risk_score'])
-            asset_types.append(asset.asset_type)
-            jurisdictions.append(asset.jurisdiction)
+        with stage("risk_scoring"):
+            for asset in portfolio.assets:
+                risk_data = risk_scorer.calculate_risk_score(asset.dict())
+                risk_scores.append(risk_data['overall_risk_score'])
+                asset_types.append(asset.asset_type)
+                jurisdictions.append(asset.jurisdiction)
         
         # Portfolio-level risk calculation
         portfolio_risk = sum(risk_scores) / len(risk_scores) if risk_scores else 50
@@ -283,6 +557,62 @@ async def analyze_portfolio(
         logger.error(f"Error in portfolio analysis: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Portfolio analysis failed: {str(e)}")
 
+# Price impact endpoint
+@app.post("/api/ai/price-impact")
+async def estimate_price_impact(
+    request: PriceImpactRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Constant-product execution price and slippage for a grid of trade sizes across pools"""
+    try:
+        trade_sizes = np.array(request.trade_sizes)
+        if (trade_sizes <= 0).any():
+            raise HTTPException(status_code=400, detail="Trade sizes must be positive")
+        
+        impact = quote_grid(
+            np.array([pool.reserve0 for pool in request.pools]),
+            np.array([pool.reserve1 for pool in request.pools]),
+            trade_sizes,
+            side=request.side,
+            fee_bps=request.fee_bps,
+            max_slippage=request.max_slippage
+        )
+        
+        def as_float(value) -> Optional[float]:
+            return float(value) if np.isfinite(value) else None
+        
+        pools = []
+        for i, pool in enumerate(request.pools):
+            pools.append({
+                "token_address": pool.token_address,
+                "spot_price": as_float(impact["spot_price"][i]),
+                "max_trade_size": float(impact["max_amount_in"][i]),
+                "quotes": [
+                    {
+                        "trade_size": float(size),
+                        "amount_out": as_float(impact["amount_out"][i, j]),
+                        "execution_price": as_float(impact["execution_price"][i, j]),
+                        "slippage": as_float(impact["slippage"][i, j]),
+                        "price_impact": as_float(impact["price_impact"][i, j])
+                    }
+                    for j, size in enumerate(trade_sizes)
+                ]
+            })
+        
+        return {
+            "side": request.side,
+            "max_slippage": request.max_slippage if request.max_slippage is not None else settings.MAX_SLIPPAGE,
+            "fee_bps": request.fee_bps if request.fee_bps is not None else settings.AMM_FEE_BPS,
+            "pools": pools,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error estimating price impact: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Price impact estimation failed: {str(e)}")
+
 # Market insights endpoint
 @app.get("/api/ai/market-insights")
 async def get_market_insights(
@@ -341,7 +671,11 @@ async def detect_anomaly(
 ):
     """Detect unusual patterns in asset data"""
     try:
-        anomaly_result = anomaly_detector.detect_anomaly(asset.dict())
+        asset_data = asset.dict()
+        if anomaly_drift.has_reference:
+            anomaly_drift.observe(anomaly_detector.prepare_features(asset_data))
+        
+        anomaly_result = anomaly_detector.detect_anomaly(asset_data)
         
         return {
             **anomaly_result,
@@ -353,13 +687,43 @@ async def detect_anomaly(
         logger.error(f"Error in anomaly detection: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Anomaly detection failed: {str(e)}")
 
+training_lock = asyncio.Lock()
+
+def train_models(training_data: List[Dict[str, Any]], tune: bool) -> Tuple[RWAPricePredictor, AnomalyDetector, Dict]:
+    """Train and persist new price and anomaly models (runs in a worker thread)"""
+    predictor = RWAPricePredictor()
+    with stage("train_price_predictor"):
+        training_metrics = predictor.train(training_data, tune=tune)
+    
+    # Extract normal data for anomaly detection
+    normal_data = [data for data in training_data if not data.get('is_anomaly', False)]
+    
+    detector = AnomalyDetector()
+    if len(normal_data) > 50:  # Need sufficient normal samples
+        with stage("train_anomaly_detector"):
+            detector.train(normal_data)
+    
+    # Persist so restarts load the new models in the background
+    with stage("save_models"):
+        os.makedirs(os.path.dirname(settings.PRICE_MODEL_PATH) or ".", exist_ok=True)
+        training_metrics["compaction"] = predictor.save_model(settings.PRICE_MODEL_PATH)
+        # Serve the persisted (compacted) model, which batch inference workers also load
+        predictor.load_model(settings.PRICE_MODEL_PATH)
+        if detector.is_trained:
+            os.makedirs(os.path.dirname(settings.ANOMALY_MODEL_PATH) or ".", exist_ok=True)
+            detector.save_model(settings.ANOMALY_MODEL_PATH)
+    
+    return predictor, detector, training_metrics
+
 # Training endpoint (admin only)
 @app.post("/api/ai/train-model")
 async def train_model(
     training_data: List[Dict[str, Any]],
+    tune: bool = False,
+    per_asset_models: bool = False,
     credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
 ):
-    """Train the AI models with new data"""
+    """Train the AI models with new data (pass ?tune=true to run a hyperparameter search first)"""
     try:
         if len(training_data) < settings.MIN_TRAINING_SAMPLES:
             raise HTTPException(
@@ -367,19 +731,36 @@ async def train_model(
                 detail=f"Insufficient training data. Need at least {settings.MIN_TRAINING_SAMPLES} samples"
             )
         
-        # Train price prediction model
-        training_metrics = price_predictor.train(training_data)
-        
-        # Extract normal data for anomaly detection
-        normal_data = [data for data in training_data if not data.get('is_anomaly', False)]
+        global price_predictor, anomaly_detector
         
-        if len(normal_data) > 50:  # Need sufficient normal samples
-            anomaly_detector.train(normal_data)
+        # Train fresh models off the event loop so health checks and predictions keep being served;
+        # the live models are only swapped once training has finished
+        async with training_lock:
+            new_predictor, new_detector, training_metrics = await run_in_executor(
+                train_models, training_data, tune
+            )
+            price_predictor = new_predictor
+            if new_detector.is_trained:
+                anomaly_detector = new_detector
+            
+            # Drift is now measured against the new training distributions
+            prediction_drift.set_reference(price_predictor.drift_snapshot)
+            anomaly_drift.set_reference(anomaly_detector.drift_snapshot)
+            
+            models_trained = ["price_predictor", "anomaly_detector"]
+            
+            # Specialized per asset type / horizon models
+            if per_asset_models:
+                with stage("train_model_router"):
+                    training_metrics["model_router"] = await run_in_executor(
+                        model_router.train, training_data
+                    )
+                models_trained.append("model_router")
         
         return {
             "status": "success",
             "training_metrics": training_metrics,
-            "models_trained": ["price_predictor", "anomaly_detector"],
+            "models_trained": models_trained,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -403,6 +784,14 @@ async def get_model_status(
             "anomaly_detector": {
                 "is_trained": anomaly_detector.is_trained
             },
+            "model_router": model_router.get_status(),
+            "batch_inference": batch_inference.get_status(),
+            "drift": {
+                "prediction_features": prediction_drift.get_status(),
+                "anomaly_features": anomaly_drift.get_status(),
+                "auto_retrain": settings.DRIFT_AUTO_RETRAIN,
+                "last_retrain_request": last_retrain_request.isoformat() if last_retrain_request else None
+            },
             "system": {
                 "uptime": datetime.now().isoformat(),
                 "version": "1.0.0"
@@ -415,7 +804,48 @@ async def get_model_status(
         logger.error(f"Error getting model status: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Status check failed: {str(e)}")
 
+def require_profiling() -> None:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILING_ENABLED=true)")
+
+# Slow request captures endpoint
+@app.get("/api/admin/slow-requests")
+async def get_slow_requests(
+    limit: Optional[int] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Most recent requests slower than SLOW_REQUEST_THRESHOLD_MS, newest first"""
+    require_profiling()
+    return {
+        "threshold_ms": settings.SLOW_REQUEST_THRESHOLD_MS,
+        "requests": slow_requests.recent(limit),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# Sampling profiler endpoint
+@app.get("/api/admin/profile", response_class=PlainTextResponse)
+async def profile_process(
+    seconds: float = 10,
+    interval_ms: Optional[float] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(verify_api_key)
+):
+    """Sample all thread stacks for `seconds`; returns collapsed stacks for flamegraph tools"""
+    require_profiling()
+    if not 0 < seconds <= settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be in (0, {settings.PROFILE_MAX_SECONDS}]"
+        )
+    interval = (interval_ms or settings.PROFILE_SAMPLE_INTERVAL_MS) / 1000
+    
+    # Sample from a worker thread so the event loop keeps serving (and shows up in the profile)
+    loop = asyncio.get_running_loop()
+    samples = await loop.run_in_executor(None, sample_process, seconds, interval)
+    return PlainTextResponse(format_collapsed(samples))
+
 if __name__ == "__main__":
+    import uvicorn
+    
     uvicorn.run(
         "main:app",
         host=settings.API_HOST,
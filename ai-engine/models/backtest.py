@@ -0,0 +1,234 @@
+import os
+import tempfile
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+import logging
+from config import settings
+from models.compact_forest import CompactForest
+from models.price_predictor import RWAPricePredictor
+
+logger = logging.getLogger(__name__)
+
+
+class PriceHistory:
+    """Panel of historical observations: timesteps x tokens.
+
+    ``features`` is (T, N, 25) in RWAPricePredictor feature order and
+    ``prices`` is (T, N); missing observations are NaN.
+    """
+
+    def __init__(self, features: np.ndarray, prices: np.ndarray, asset_types: np.ndarray,
+                 token_addresses: List[str], timestamps: Optional[List] = None):
+        self.features = features
+        self.prices = prices
+        self.asset_types = np.asarray(asset_types)
+        self.token_addresses = list(token_addresses)
+        self.timestamps = timestamps if timestamps is not None else list(range(prices.shape[0]))
+
+    @property
+    def n_steps(self) -> int:
+        return self.prices.shape[0]
+
+    @property
+    def n_tokens(self) -> int:
+        return self.prices.shape[1]
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'PriceHistory':
+        """Pivot flat records (token_address, observed_at, asset_type, AssetData fields) into a panel"""
+        predictor = RWAPricePredictor()
+        tokens = sorted({record['token_address'] for record in records})
+        timestamps = sorted({record['observed_at'] for record in records})
+        token_index = {token: i for i, token in enumerate(tokens)}
+        time_index = {timestamp: i for i, timestamp in enumerate(timestamps)}
+
+        n_features = len(predictor.generate_feature_names())
+        features = np.full((len(timestamps), len(tokens), n_features), np.nan, dtype=np.float32)
+        prices = np.full((len(timestamps), len(tokens)), np.nan)
+        asset_types = np.full(len(tokens), 'UNKNOWN', dtype=object)
+
+        for record in records:
+            t, n = time_index[record['observed_at']], token_index[record['token_address']]
+            features[t, n] = predictor.prepare_features(record)[0]
+            prices[t, n] = record['current_price']
+            asset_types[n] = record.get('asset_type', 'UNKNOWN')
+
+        return cls(features, prices, asset_types, tokens, timestamps)
+
+
+def walk_forward_windows(n_steps: int, train_window: int, test_window: int, horizon: int) -> List[Tuple[int, int]]:
+    """(start, end) test ranges; each window trains on the train_window steps before start"""
+    windows = []
+    start = train_window
+    while start < n_steps - horizon:
+        windows.append((start, min(start + test_window, n_steps - horizon)))
+        start += test_window
+    return windows
+
+
+def _fit_window(features: np.ndarray, prices: np.ndarray, start: int,
+                train_window: int, horizon: int) -> RWAPricePredictor:
+    """Train on steps whose horizon target is already observed at `start` (runs in a worker)"""
+    first, last = max(0, start - train_window), start - horizon + 1
+    X = features[first:last].reshape(-1, features.shape[2])
+    y = prices[first + horizon:last + horizon].reshape(-1)
+    usable = np.isfinite(X).all(axis=1) & np.isfinite(y)
+
+    predictor = RWAPricePredictor(
+        n_estimators=settings.BACKTEST_N_ESTIMATORS,
+        max_depth=settings.BACKTEST_MAX_DEPTH,
+        n_jobs=1
+    )
+    predictor.fit(X[usable], y[usable])
+    # Ship only the flat float32 trees back to the parent
+    predictor.model = CompactForest.from_forest(predictor.model)
+    return predictor
+
+
+def _predict_shard(predictor: RWAPricePredictor, features: np.ndarray, start: int, end: int,
+                   token_start: int, token_end: int) -> Tuple[int, int, int, int, np.ndarray]:
+    """Batch-predict every (step, token) in one window x token shard (runs in a worker)"""
+    block = features[start:end, token_start:token_end]
+    X = block.reshape(-1, block.shape[2])
+    usable = np.isfinite(X).all(axis=1)
+
+    predictions = np.full(len(X), np.nan)
+    if usable.any():
+        predictions[usable] = predictor.predict_batch(X[usable])[0]
+    return start, end, token_start, token_end, predictions.reshape(block.shape[:2])
+
+
+def simulate_signals(predictions: np.ndarray, prices: np.ndarray, asset_types: np.ndarray,
+                     horizon: int, fee_bps: float, threshold_percent: float) -> Dict:
+    """Turn predictions into BUY/SELL/HOLD positions and score them per asset type.
+
+    Positions are held for the prediction horizon, the same span hit_rate is
+    judged over: each step opens a 1/horizon long (BUY) or short (SELL) sleeve
+    and closes the one opened horizon steps earlier. Fees are charged on the
+    net change of position between those two sleeves.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diff_percent = (predictions - prices) / prices * 100
+        horizon_returns = np.zeros_like(prices)
+        horizon_returns[:-horizon] = prices[horizon:] / prices[:-horizon] - 1
+
+    signals = np.where(diff_percent > threshold_percent, 1, np.where(diff_percent < -threshold_percent, -1, 0))
+    signals[~np.isfinite(diff_percent)] = 0
+    horizon_returns[~np.isfinite(horizon_returns)] = 0
+
+    # Hit = price moved in the signalled direction over the prediction horizon
+    future = np.full_like(prices, np.nan)
+    future[:-horizon] = prices[horizon:]
+    evaluable = (signals != 0) & np.isfinite(future) & np.isfinite(prices)
+    hits = evaluable & (np.sign(future - prices) == signals)
+
+    closed = np.zeros_like(signals)
+    closed[horizon:] = signals[:-horizon]
+    position_changes = np.abs(signals - closed) / horizon
+    gross = signals * horizon_returns / horizon
+    fees = position_changes * fee_bps / 10000
+
+    def summarize(columns: np.ndarray) -> Dict:
+        n_evaluable = int(evaluable[:, columns].sum())
+        return {
+            'tokens': int(columns.sum()),
+            'buy_signals': int((signals[:, columns] == 1).sum()),
+            'sell_signals': int((signals[:, columns] == -1).sum()),
+            'hit_rate': round(float(hits[:, columns].sum() / n_evaluable), 4) if n_evaluable else None,
+            'gross_pnl': round(float(gross[:, columns].sum()), 6),
+            'fees': round(float(fees[:, columns].sum()), 6),
+            'net_pnl': round(float((gross - fees)[:, columns].sum()), 6),
+            'turnover': round(float(position_changes[:, columns].sum()), 2)
+        }
+
+    return {
+        'overall': summarize(np.ones(len(asset_types), dtype=bool)),
+        'by_asset_type': {
+            asset_type: summarize(asset_types == asset_type)
+            for asset_type in sorted(set(asset_types))
+        }
+    }
+
+
+def _memmap(array: np.ndarray, filepath: str) -> np.ndarray:
+    np.save(filepath, array)
+    return np.load(filepath, mmap_mode='r')
+
+
+def run_backtest(history: PriceHistory, train_window: Optional[int] = None, test_window: Optional[int] = None,
+                 horizon: Optional[int] = None, fee_bps: Optional[float] = None,
+                 threshold_percent: Optional[float] = None, n_jobs: Optional[int] = None) -> Dict:
+    """Walk-forward backtest of predictor recommendations over a price history"""
+    from joblib import Parallel, delayed
+
+    train_window = settings.BACKTEST_TRAIN_WINDOW if train_window is None else train_window
+    test_window = settings.BACKTEST_TEST_WINDOW if test_window is None else test_window
+    horizon = settings.BACKTEST_HORIZON_STEPS if horizon is None else horizon
+    fee_bps = settings.BACKTEST_FEE_BPS if fee_bps is None else fee_bps
+    threshold_percent = settings.RECOMMENDATION_THRESHOLD_PERCENT if threshold_percent is None else threshold_percent
+    n_jobs = n_jobs or min(settings.TRAIN_N_WORKERS, os.cpu_count() or 1)
+
+    if min(train_window, test_window, horizon) < 1:
+        raise ValueError("train_window, test_window and horizon must be at least one step")
+
+    windows = walk_forward_windows(history.n_steps, train_window, test_window, horizon)
+    if not windows:
+        raise ValueError(f"History of {history.n_steps} steps is too short for a {train_window}-step training window")
+
+    started = time.perf_counter()
+    parallel = Parallel(n_jobs=n_jobs, backend='loky')
+
+    with tempfile.TemporaryDirectory(prefix='backtest-') as tmp_dir:
+        # Written once and passed as memmaps, which pickle as a file reference; plain
+        # arrays would be hashed by joblib's auto-memmapping again for every task
+        features = _memmap(history.features, os.path.join(tmp_dir, 'features.npy'))
+        prices = _memmap(history.prices, os.path.join(tmp_dir, 'prices.npy'))
+
+        # Stage 1: one model per walk-forward window
+        predictors = parallel(
+            delayed(_fit_window)(features, prices, start, train_window, horizon)
+            for start, _ in windows
+        )
+        fit_time = time.perf_counter() - started
+
+        # Stage 2: batch predictions per window x token shard
+        shard_size = max(1, -(-history.n_tokens // n_jobs))
+        shards = parallel(
+            delayed(_predict_shard)(predictor, features, start, end, token_start,
+                                    min(token_start + shard_size, history.n_tokens))
+            for predictor, (start, end) in zip(predictors, windows)
+            for token_start in range(0, history.n_tokens, shard_size)
+        )
+        del features, prices
+
+    predictions = np.full(history.prices.shape, np.nan)
+    for start, end, token_start, token_end, block in shards:
+        predictions[start:end, token_start:token_end] = block
+
+    report = simulate_signals(
+        predictions, history.prices, history.asset_types, horizon, fee_bps, threshold_percent
+    )
+    wall_time = time.perf_counter() - started
+
+    logger.info(
+        f"Backtest of {history.n_tokens} tokens x {history.n_steps} steps finished in {wall_time:.2f}s "
+        f"({len(windows)} windows, {n_jobs} workers)"
+    )
+
+    report.update({
+        'config': {
+            'train_window': train_window,
+            'test_window': test_window,
+            'horizon': horizon,
+            'fee_bps': fee_bps,
+            'threshold_percent': threshold_percent
+        },
+        'tokens': history.n_tokens,
+        'steps': history.n_steps,
+        'windows': len(windows),
+        'n_workers': n_jobs,
+        'fit_time_s': round(fit_time, 3),
+        'wall_time_s': round(wall_time, 3)
+    })
+    return report
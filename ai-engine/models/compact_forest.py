@@ -0,0 +1,233 @@
+import pickle
+import time
+import numpy as np
+from typing import Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPACT_FORMAT = 'compact-forest-v1'
+
+
+class CompactForest:
+    """Flat float32 representation of a fitted RandomForestRegressor.
+
+    All trees are concatenated into five parallel node arrays. Leaves point to
+    themselves, so a batch is evaluated by stepping every (row, tree) pair
+    ``max_depth`` times without any per-tree Python loop.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, value: np.ndarray, roots: np.ndarray, max_depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_forest(cls, forest) -> 'CompactForest':
+        """Flatten the estimators of a fitted sklearn forest"""
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int16),
+            threshold=_float32_thresholds(np.concatenate(thresholds)),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values).astype(np.float32),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=int(max_depth)
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict) -> 'CompactForest':
+        """Rebuild from the dict written by to_arrays (arrays may be memory-mapped)"""
+        return cls(
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            left=arrays['left'],
+            right=arrays['right'],
+            value=arrays['value'],
+            roots=arrays['roots'],
+            max_depth=int(arrays['max_depth'])
+        )
+
+    def to_arrays(self) -> Dict:
+        """Plain dict of numpy arrays suitable for joblib.dump"""
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'roots': self.roots,
+            'max_depth': self.max_depth
+        }
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(
+            array.nbytes for array in
+            (self.feature, self.threshold, self.left, self.right, self.value, self.roots)
+        ))
+
+    def predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Per-tree predictions, shape (n_samples, n_trees)"""
+        # sklearn also casts inputs to float32; thresholds were rounded down to match its float64 compare
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        return self.value[nodes]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Forest prediction (mean over trees)"""
+        return self.predict_trees(X).mean(axis=1)
+
+    def select_trees(self, keep: List[int]) -> 'CompactForest':
+        """New forest containing only the given tree indices"""
+        ends = np.append(self.roots[1:], len(self.feature))
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+
+        for index in keep:
+            start, end = int(self.roots[index]), int(ends[index])
+            shift = offset - start
+            features.append(self.feature[start:end])
+            thresholds.append(self.threshold[start:end])
+            lefts.append(self.left[start:end] + shift)
+            rights.append(self.right[start:end] + shift)
+            values.append(self.value[start:end])
+            roots.append(offset)
+            offset += end - start
+
+        return CompactForest(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=self.max_depth
+        )
+
+    def prune(self, X_val: np.ndarray, y_val: np.ndarray, tolerance: float,
+              min_trees: int = 1) -> 'CompactForest':
+        """Greedily drop trees while validation RMSE stays within (1 + tolerance) of the full forest"""
+        tree_predictions = self.predict_trees(X_val).astype(np.float64)
+        y_val = np.asarray(y_val, dtype=np.float64)
+
+        keep = list(range(self.n_trees))
+        total = tree_predictions.sum(axis=1)
+        rmse_limit = _rmse(total / len(keep), y_val) * (1 + tolerance)
+
+        while len(keep) > max(1, min_trees):
+            # RMSE of the ensemble with each remaining tree removed, all candidates at once
+            remaining = tree_predictions[:, keep]
+            without = (total[:, None] - remaining) / (len(keep) - 1)
+            candidate_rmse = np.sqrt(np.mean((without - y_val[:, None]) ** 2, axis=0))
+
+            best = int(np.argmin(candidate_rmse))
+            if candidate_rmse[best] > rmse_limit:
+                break
+
+            total = total - remaining[:, best]
+            keep.pop(best)
+
+        return self.select_trees(keep)
+
+
+def _float32_thresholds(thresholds: np.ndarray) -> np.ndarray:
+    """Largest float32 at or below each float64 threshold.
+
+    sklearn evaluates ``float32(x) <= float64(t)``; for float32 x that is
+    exactly ``x <= t32`` with t32 rounded down, whereas round-to-nearest can
+    move t32 above t and send boundary values the other way.
+    """
+    thresholds32 = thresholds.astype(np.float32)
+    rounded_up = thresholds32.astype(np.float64) > thresholds
+    thresholds32[rounded_up] = np.nextafter(thresholds32[rounded_up], np.float32(-np.inf))
+    return thresholds32
+
+
+def _rmse(predictions: np.ndarray, targets: np.ndarray) -> float:
+    return float(np.sqrt(np.mean((predictions - targets) ** 2)))
+
+
+def _single_row_latency_ms(predict_fn, X: np.ndarray, repeats: int = 50) -> float:
+    row = X[:1]
+    started = time.perf_counter()
+    for _ in range(repeats):
+        predict_fn(row)
+    return (time.perf_counter() - started) / repeats * 1000
+
+
+def compact_forest(forest, X_val: Optional[np.ndarray] = None, y_val: Optional[np.ndarray] = None,
+                   prune_tolerance: float = 0.0, min_trees: int = 1,
+                   X_prune: Optional[np.ndarray] = None, y_prune: Optional[np.ndarray] = None):
+    """Convert (and optionally prune) a fitted forest, returning (CompactForest, report).
+
+    Trees are selected on (X_prune, y_prune), which must be held out from both
+    the forest's training data and (X_val, y_val); the report's RMSE is measured
+    on (X_val, y_val) only, so it is not biased by the selection.
+    """
+    compact = CompactForest.from_forest(forest)
+    original_trees = compact.n_trees
+
+    has_validation = X_val is not None and y_val is not None and len(y_val) > 0
+    has_prune_set = X_prune is not None and y_prune is not None and len(y_prune) > 0
+    if has_prune_set and prune_tolerance > 0:
+        compact = compact.prune(X_prune, y_prune, prune_tolerance, min_trees)
+
+    report = {
+        'format': COMPACT_FORMAT,
+        'original_trees': original_trees,
+        'compact_trees': compact.n_trees,
+        'original_bytes': len(pickle.dumps(forest, protocol=pickle.HIGHEST_PROTOCOL)),
+        'compact_bytes': compact.nbytes,
+        'prune_samples': len(y_prune) if has_prune_set else 0,
+    }
+    report['size_reduction_percent'] = round(
+        (1 - report['compact_bytes'] / report['original_bytes']) * 100, 2
+    )
+
+    if has_validation:
+        report['original_val_rmse'] = _rmse(forest.predict(X_val), y_val)
+        report['compact_val_rmse'] = _rmse(compact.predict(X_val), y_val)
+        report['original_latency_ms'] = round(_single_row_latency_ms(forest.predict, X_val), 4)
+        report['compact_latency_ms'] = round(_single_row_latency_ms(compact.predict, X_val), 4)
+
+    logger.info(
+        f"Compacted forest: {original_trees} -> {compact.n_trees} trees, "
+        f"{report['original_bytes']} -> {report['compact_bytes']} bytes"
+    )
+
+    return compact, report
@@ -0,0 +1,193 @@
+import random
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+import logging
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Floor for empty histogram bins so PSI stays finite
+PSI_EPSILON = 1e-4
+
+
+def _bin_counts(X: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Histogram counts per feature, shape (n_features, n_bins)"""
+    n_features, n_edges = edges.shape
+    counts = np.zeros((n_features, n_edges + 1))
+    # Bin index = number of inner edges <= value (padded +inf edges never count)
+    bins = (edges[None, :, :] <= X[:, :, None]).sum(axis=2)
+    np.add.at(counts, (np.broadcast_to(np.arange(n_features), bins.shape), bins), 1)
+    return counts
+
+
+def build_reference_snapshot(X: np.ndarray, feature_names: List[str], n_bins: Optional[int] = None,
+                             sample_size: Optional[int] = None, seed: int = 42,
+                             exclude_features: Optional[List[str]] = None) -> Dict:
+    """Summarize the training distribution: quantile bin edges, bin proportions and a sample for KS.
+
+    Features in exclude_features (e.g. wall-clock features) are still tracked
+    but never flagged as drifted.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    n_bins = n_bins or settings.DRIFT_HISTOGRAM_BINS
+    sample_size = sample_size or settings.DRIFT_RESERVOIR_SIZE
+
+    # Quantile edges per feature; repeated edges (e.g. many zeros) collapse and are padded with +inf
+    quantiles = np.quantile(X, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0).T
+    edges = np.full((X.shape[1], n_bins - 1), np.inf)
+    for i, feature_edges in enumerate(quantiles):
+        unique_edges = np.unique(feature_edges)
+        edges[i, :len(unique_edges)] = unique_edges
+
+    counts = _bin_counts(X, edges)
+    rng = np.random.default_rng(seed)
+    sample_rows = rng.choice(len(X), size=min(sample_size, len(X)), replace=False)
+
+    return {
+        'feature_names': list(feature_names),
+        'bin_edges': edges,
+        'reference_proportions': counts / counts.sum(axis=1, keepdims=True),
+        'reference_sample': X[sample_rows],
+        'excluded_features': list(exclude_features or []),
+        'created_at': datetime.now().isoformat()
+    }
+
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """PSI per feature from (n_features, n_bins) proportion matrices"""
+    expected = np.maximum(expected, PSI_EPSILON)
+    actual = np.maximum(actual, PSI_EPSILON)
+    return ((actual - expected) * np.log(actual / expected)).sum(axis=1)
+
+
+def ks_statistic(reference: np.ndarray, live: np.ndarray) -> np.ndarray:
+    """Two-sample Kolmogorov-Smirnov statistic per feature column"""
+    stats = np.zeros(reference.shape[1])
+    for i in range(reference.shape[1]):
+        ref = np.sort(reference[:, i])
+        cur = np.sort(live[:, i])
+        points = np.concatenate([ref, cur])
+        ref_cdf = np.searchsorted(ref, points, side='right') / len(ref)
+        cur_cdf = np.searchsorted(cur, points, side='right') / len(cur)
+        stats[i] = np.max(np.abs(ref_cdf - cur_cdf))
+    return stats
+
+
+class DriftMonitor:
+    """Tracks live feature distributions against a training snapshot.
+
+    Each observation updates a fixed-size reservoir sample and per-feature
+    histograms over the snapshot's bins, so memory is bounded and the
+    per-request cost does not grow with traffic.
+    """
+
+    def __init__(self, name: str, reservoir_size: Optional[int] = None, seed: int = 42):
+        self.name = name
+        self.reservoir_size = reservoir_size or settings.DRIFT_RESERVOIR_SIZE
+        self.snapshot: Optional[Dict] = None
+        self.last_report: Optional[Dict] = None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._reset_window()
+
+    def _reset_window(self) -> None:
+        self.observations = 0
+        self._reservoir: Optional[np.ndarray] = None
+        self._counts: Optional[np.ndarray] = None
+        if self.snapshot is not None:
+            n_features = len(self.snapshot['feature_names'])
+            self._reservoir = np.zeros((self.reservoir_size, n_features))
+            self._counts = np.zeros_like(self.snapshot['reference_proportions'])
+
+    @property
+    def has_reference(self) -> bool:
+        return self.snapshot is not None
+
+    def set_reference(self, snapshot: Optional[Dict]) -> None:
+        """Install a new training snapshot and start a fresh observation window"""
+        with self._lock:
+            self.snapshot = snapshot
+            self.last_report = None
+            self._reset_window()
+
+    def observe(self, features: np.ndarray) -> None:
+        """Record one feature vector (no-op until a reference snapshot is set)"""
+        if self.snapshot is None:
+            return
+
+        row = np.asarray(features, dtype=np.float64).ravel()
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot is None:
+                return
+            # Streaming histogram update
+            bins = (snapshot['bin_edges'] <= row[:, None]).sum(axis=1)
+            self._counts[np.arange(len(row)), bins] += 1
+
+            # Reservoir sampling (Algorithm R)
+            if self.observations < self.reservoir_size:
+                self._reservoir[self.observations] = row
+            else:
+                slot = self._random.randint(0, self.observations)
+                if slot < self.reservoir_size:
+                    self._reservoir[slot] = row
+            self.observations += 1
+
+    def check(self, min_samples: Optional[int] = None) -> Optional[Dict]:
+        """Compare the current window with the snapshot; returns None if too few observations"""
+        min_samples = min_samples or settings.DRIFT_MIN_SAMPLES
+
+        with self._lock:
+            # set_reference may swap the snapshot once the lock is released
+            snapshot = self.snapshot
+            if snapshot is None or self.observations < min_samples:
+                return None
+            observations = self.observations
+            counts = self._counts.copy()
+            live_sample = self._reservoir[:min(observations, self.reservoir_size)].copy()
+            self._reset_window()
+
+        psi = population_stability_index(
+            snapshot['reference_proportions'],
+            counts / counts.sum(axis=1, keepdims=True)
+        )
+        ks = ks_statistic(snapshot['reference_sample'], live_sample)
+
+        features = {
+            name: {'psi': round(float(psi[i]), 4), 'ks': round(float(ks[i]), 4)}
+            for i, name in enumerate(snapshot['feature_names'])
+        }
+        excluded = set(snapshot.get('excluded_features', []))
+        monitored = np.array([name not in excluded for name in snapshot['feature_names']])
+        drifted = [
+            name for name, stats in features.items()
+            if name not in excluded
+            and (stats['psi'] > settings.DRIFT_PSI_THRESHOLD or stats['ks'] > settings.DRIFT_KS_THRESHOLD)
+        ]
+
+        report = {
+            'observations': observations,
+            'max_psi': round(float(psi[monitored].max()), 4),
+            'mean_psi': round(float(psi[monitored].mean()), 4),
+            'max_ks': round(float(ks[monitored].max()), 4),
+            'drift_detected': len(drifted) > 0,
+            'drifted_features': drifted,
+            'features': features,
+            'checked_at': datetime.now().isoformat()
+        }
+        self.last_report = report
+
+        if drifted:
+            logger.warning(f"Drift detected in {self.name} features: {', '.join(drifted)}")
+
+        return report
+
+    def get_status(self) -> Dict:
+        return {
+            'has_reference': self.has_reference,
+            'reference_created_at': self.snapshot['created_at'] if self.snapshot else None,
+            'window_observations': self.observations,
+            'last_report': self.last_report
+        }
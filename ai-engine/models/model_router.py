@@ -0,0 +1,199 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+from config import settings
+from models.price_predictor import RWAPricePredictor, ASSET_TYPE_CODES
+
+logger = logging.getLogger(__name__)
+
+HORIZONS: List[str] = ['1h', '24h', '7d']
+
+
+def _target_key(horizon: str) -> str:
+    return f"target_price_{horizon}"
+
+
+def _route_target(record: Dict, horizon: str) -> Optional[float]:
+    """Target price for a horizon; plain target_price is treated as the 24h target"""
+    target = record.get(_target_key(horizon))
+    if target is None and horizon == '24h':
+        target = record.get('target_price')
+    return target
+
+
+def _train_route(asset_type: str, horizon: str, records: List[Dict], filepath: str) -> Dict:
+    """Train and save one specialized model (runs inside a worker process)"""
+    predictor = RWAPricePredictor(
+        n_estimators=settings.ROUTER_N_ESTIMATORS,
+        max_depth=settings.ROUTER_MAX_DEPTH,
+        n_jobs=1
+    )
+    # The router already parallelizes across routes, so CV stays sequential here
+    metrics = predictor.train(records, n_jobs=1)
+    predictor.save_model(filepath)
+
+    return {
+        'asset_type': asset_type,
+        'horizon': horizon,
+        'rmse': metrics['rmse'],
+        'r2_score': metrics['r2_score'],
+        'cv_rmse': metrics['cv_rmse'],
+        'training_samples': metrics['training_samples']
+    }
+
+
+class ModelRouter:
+    """Routes predictions to one small model per (asset_type, horizon).
+
+    Models live on disk and are loaded on first use into an LRU cache, so
+    rarely requested routes do not hold memory.
+    """
+
+    def __init__(self, models_dir: Optional[str] = None, cache_size: Optional[int] = None):
+        self.models_dir = models_dir or settings.ROUTER_MODELS_DIR
+        self.cache_size = max(1, cache_size or settings.ROUTER_CACHE_SIZE)
+        self._cache: 'OrderedDict[Tuple[str, str], RWAPricePredictor]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Routes with a saved model, scanned from disk on first use and after training
+        self._routes: Optional[Set[Tuple[str, str]]] = None
+        self.last_trained: Optional[datetime] = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @staticmethod
+    def is_valid_route(asset_type: str, horizon: str) -> bool:
+        return asset_type in ASSET_TYPE_CODES and horizon in HORIZONS
+
+    def model_path(self, asset_type: str, horizon: str) -> str:
+        # Both parts end up in a file name, so only known values are accepted
+        if not self.is_valid_route(asset_type, horizon):
+            raise ValueError(f"Unknown route {asset_type}/{horizon}")
+        return os.path.join(self.models_dir, f"{asset_type}_{horizon}.joblib")
+
+    def refresh_routes(self) -> List[Tuple[str, str]]:
+        """Rescan the models directory for saved routes"""
+        routes = {
+            (asset_type, horizon)
+            for asset_type in ASSET_TYPE_CODES
+            for horizon in HORIZONS
+            if os.path.exists(self.model_path(asset_type, horizon))
+        }
+        with self._lock:
+            self._routes = routes
+        return sorted(routes)
+
+    def available_routes(self) -> List[Tuple[str, str]]:
+        """Routes that have a saved model on disk"""
+        routes = self._routes
+        if routes is None:
+            return self.refresh_routes()
+        return sorted(routes)
+
+    def has_route(self, asset_type: str, horizon: str) -> bool:
+        routes = self._routes
+        if routes is None:
+            self.refresh_routes()
+            routes = self._routes
+        return (asset_type, horizon) in routes
+
+    def train(self, training_data: List[Dict], n_jobs: Optional[int] = None) -> Dict:
+        """Train every (asset_type, horizon) route with enough samples, in parallel"""
+        from joblib import Parallel, delayed
+
+        os.makedirs(self.models_dir, exist_ok=True)
+
+        # Group records by route, keeping only those labelled for the horizon
+        routes: Dict[Tuple[str, str], List[Dict]] = {}
+        for record in training_data:
+            asset_type = record.get('asset_type')
+            if asset_type not in ASSET_TYPE_CODES:
+                continue
+            for horizon in HORIZONS:
+                target = _route_target(record, horizon)
+                if target is not None:
+                    routes.setdefault((asset_type, horizon), []).append({**record, 'target_price': target})
+
+        trainable = {
+            route: records for route, records in routes.items()
+            if len(records) >= settings.MIN_TRAINING_SAMPLES
+        }
+        skipped = sorted(f"{asset_type}/{horizon}" for asset_type, horizon in set(routes) - set(trainable))
+
+        n_workers = n_jobs or min(len(trainable), settings.TRAIN_N_WORKERS) or 1
+        results = Parallel(n_jobs=n_workers, backend='loky')(
+            delayed(_train_route)(asset_type, horizon, records, self.model_path(asset_type, horizon))
+            for (asset_type, horizon), records in sorted(trainable.items())
+        )
+
+        # Models from earlier runs for routes that were not retrained would otherwise keep serving
+        removed = []
+        for asset_type, horizon in self.refresh_routes():
+            if (asset_type, horizon) not in trainable:
+                os.remove(self.model_path(asset_type, horizon))
+                removed.append(f"{asset_type}/{horizon}")
+
+        # Cached models are stale now; they reload lazily from the new files
+        with self._lock:
+            self._cache.clear()
+            self._routes = set(trainable)
+        self.last_trained = datetime.now()
+
+        logger.info(
+            f"Model router trained {len(results)} routes ({len(skipped)} skipped, "
+            f"{len(removed)} stale removed) with {n_workers} workers"
+        )
+
+        return {
+            'routes_trained': results,
+            'routes_skipped': skipped,
+            'routes_removed': removed,
+            'n_workers': n_workers
+        }
+
+    def get_model(self, asset_type: str, horizon: str) -> RWAPricePredictor:
+        """Return the route's model, loading it from disk and evicting the LRU entry if needed"""
+        key = (asset_type, horizon)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+
+        if not self.has_route(asset_type, horizon):
+            raise KeyError(f"No model for asset type {asset_type} and horizon {horizon}")
+        filepath = self.model_path(asset_type, horizon)
+
+        predictor = RWAPricePredictor()
+        predictor.load_model(filepath)
+
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[key] = predictor
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                evicted, _ = self._cache.popitem(last=False)
+                logger.info(f"Evicted router model {evicted[0]}/{evicted[1]}")
+
+        return predictor
+
+    def predict(self, asset_data: Dict, horizon: str = '24h') -> Tuple[float, float]:
+        """Predict with the specialized model for the asset's type and the horizon"""
+        if horizon not in HORIZONS:
+            raise ValueError(f"Unknown horizon {horizon}. Expected one of {HORIZONS}")
+        return self.get_model(asset_data.get('asset_type'), horizon).predict(asset_data)
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            cached = [f"{asset_type}/{horizon}" for asset_type, horizon in self._cache]
+        return {
+            'available_routes': [f"{asset_type}/{horizon}" for asset_type, horizon in self.available_routes()],
+            'cached_routes': cached,
+            'cache_size': self.cache_size,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'last_trained': self.last_trained.isoformat() if self.last_trained else None
+        }
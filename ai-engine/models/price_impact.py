@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+from config import settings
+
+# Pools follow DEXCore: reserve0 is the RWA token, reserve1 is USDC, and the
+# trading fee is taken from the input amount before the constant-product swap.
+
+
+def constant_product_impact(reserve_in: np.ndarray, reserve_out: np.ndarray, amounts_in: np.ndarray,
+                            fee_bps: Optional[float] = None,
+                            max_slippage: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Swap outcomes for every (pool, trade size) pair in one broadcast.
+
+    reserve_in / reserve_out have shape (P,) and amounts_in shape (S,).
+    Prices are in output units per input unit. Returns amount_out,
+    execution_price, slippage (vs. spot, fee included) and price_impact
+    (move in the pool's spot price) as (P, S) arrays, plus spot_price and
+    max_amount_in (largest trade within max_slippage) as (P,) arrays.
+    Pools with an empty reserve yield NaN quotes and a zero max size.
+    """
+    fee = (settings.AMM_FEE_BPS if fee_bps is None else fee_bps) / 10000
+    max_slippage = settings.MAX_SLIPPAGE if max_slippage is None else max_slippage
+
+    reserve_in = np.asarray(reserve_in, dtype=np.float64)[:, None]
+    reserve_out = np.asarray(reserve_out, dtype=np.float64)[:, None]
+    amounts_in = np.asarray(amounts_in, dtype=np.float64)[None, :]
+    valid = (reserve_in > 0) & (reserve_out > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        spot_price = np.where(valid, reserve_out / reserve_in, np.nan)
+
+        amount_in_after_fee = amounts_in * (1 - fee)
+        amount_out = reserve_out * amount_in_after_fee / (reserve_in + amount_in_after_fee)
+        execution_price = amount_out / amounts_in
+        slippage = 1 - execution_price / spot_price
+
+        # Spot after the swap; the full input (fee included) stays in the pool
+        post_trade_price = (reserve_out - amount_out) / (reserve_in + amounts_in)
+        price_impact = 1 - post_trade_price / spot_price
+
+        # Closed form for execution_price == spot * (1 - max_slippage); zero when the fee alone exceeds it
+        max_amount_in = reserve_in * (max_slippage - fee) / ((1 - max_slippage) * (1 - fee))
+
+    max_amount_in = np.where(valid & (max_amount_in > 0), max_amount_in, 0.0)
+
+    return {
+        'spot_price': spot_price[:, 0],
+        'amount_out': np.where(valid, amount_out, np.nan),
+        'execution_price': np.where(valid, execution_price, np.nan),
+        'slippage': np.where(valid, slippage, np.nan),
+        'price_impact': np.where(valid, price_impact, np.nan),
+        'max_amount_in': max_amount_in[:, 0]
+    }
+
+
+def pool_direction(side: str, reserve0: np.ndarray, reserve1: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(reserve_in, reserve_out) for a buy (USDC in) or sell (RWA token in)"""
+    if side == 'buy':
+        return reserve1, reserve0
+    if side == 'sell':
+        return reserve0, reserve1
+    raise ValueError(f"Unknown side {side}. Expected 'buy' or 'sell'")
+
+
+def quote_grid(reserve0: np.ndarray, reserve1: np.ndarray, trade_sizes: np.ndarray, side: str = 'buy',
+               fee_bps: Optional[float] = None, max_slippage: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Constant-product quotes with prices expressed in USDC per RWA token.
+
+    trade_sizes are in the input token: USDC for buys, RWA tokens for sells.
+    """
+    reserve_in, reserve_out = pool_direction(side, reserve0, reserve1)
+    impact = constant_product_impact(reserve_in, reserve_out, trade_sizes, fee_bps, max_slippage)
+
+    if side == 'buy':
+        # Output is RWA tokens per USDC; invert to USDC per token
+        with np.errstate(divide='ignore'):
+            impact['spot_price'] = 1 / impact['spot_price']
+            impact['execution_price'] = 1 / impact['execution_price']
+
+    return impact
+
+
+def reference_slippage(reserve0: float, reserve1: float, trade_size: Optional[float] = None) -> Optional[float]:
+    """Slippage of a reference USDC buy, or None when the pool has no reserves"""
+    if reserve0 <= 0 or reserve1 <= 0:
+        return None
+    trade_size = trade_size or settings.RISK_REFERENCE_TRADE_SIZE
+    impact = quote_grid(np.array([reserve0]), np.array([reserve1]), np.array([trade_size]), side='buy')
+    return float(impact['slippage'][0, 0])
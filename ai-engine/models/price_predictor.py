@@ -1,30 +1,94 @@
+import os
+import tempfile
+import time
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 import joblib
-from sklearn.ensemble import RandomForestRegressor, IsolationForest
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-from sklearn.preprocessing import StandardScaler
 import logging
 from config import settings
+from models.compact_forest import CompactForest, compact_forest, COMPACT_FORMAT
+from models.drift_monitor import build_reference_snapshot
+from models.price_impact import reference_slippage
+from instrumentation import stage
 
 logger = logging.getLogger(__name__)
 
+# sklearn is imported inside the methods that need it: importing it costs more
+# than the rest of the service, and serving a compact model never touches it.
+
+# Integer codes for the asset_type_encoded feature (0 = unknown)
+ASSET_TYPE_CODES: Dict[str, int] = {
+    'RealEstate': 1,
+    'Bond': 2,
+    'Invoice': 3,
+    'Commodity': 4,
+    'Equipment': 5
+}
+
+def atomic_dump(value, filepath: str) -> None:
+    """joblib.dump to a temp file in the same directory, then rename over filepath.
+
+    Models are loaded with mmap_mode='r' by other processes; rewriting the file
+    in place would truncate pages they have mapped (SIGBUS), while a rename
+    leaves their old inode intact.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(filepath) or '.', prefix=f".{os.path.basename(filepath)}.", suffix='.tmp'
+    )
+    os.close(fd)
+    try:
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
 class RWAPricePredictor:
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            n_jobs=-1
-        )
-        self.scaler = StandardScaler()
+    # Search space for tune_hyperparameters (RandomForestRegressor parameter names)
+    DEFAULT_PARAM_GRID: Dict[str, List] = {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [6, 10, 14, None],
+        'min_samples_leaf': [1, 2, 4],
+        'max_features': [1.0, 0.5, 'sqrt']
+    }
+    
+    # Wall-clock features are taken at training time, so they are not drift-checked
+    TIME_FEATURES: List[str] = ['hour', 'weekday', 'day']
+    
+    # Not fields of the serving API's AssetData, so live requests always carry the
+    # prepare_features defaults; drift-checking them would flag them every time
+    UNSERVED_FEATURES: List[str] = [
+        'liquidity_depth', 'trading_pairs_count', 'time_since_launch_days',
+        'rsi', 'moving_avg_ratio_7d', 'moving_avg_ratio_30d', 'bollinger_position'
+    ]
+    
+    def __init__(self, n_estimators: int = 100, max_depth: int = 10, n_jobs: int = -1):
+        self.n_estimators = n_estimators
+        self.max_depth = max_depth
+        self.n_jobs = n_jobs
+        # Built on first train() or load_model()
+        self.model = None
+        self.scaler = None
         self.feature_columns: List[str] = []
         self.is_trained: bool = False
         self.last_trained: Optional[datetime] = None
         self.feature_importance: Dict[str, float] = {}
+        self.validation_set: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.prune_set: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.compaction_report: Dict = {}
+        self.drift_snapshot: Optional[Dict] = None
+    
+    def _new_forest(self):
+        from sklearn.ensemble import RandomForestRegressor
+        
+        return RandomForestRegressor(
+            n_estimators=self.n_estimators,
+            max_depth=self.max_depth,
+            random_state=42,
+            n_jobs=self.n_jobs
+        )
         
     def prepare_features(self, asset_data: Dict) -> np.ndarray:
         """Extract and engineer features from asset data"""
@@ -35,7 +99,7 @@ class RWAPricePredictor:
             asset_data.get('total_asset_value', 0),
             asset_data.get('yield_rate', 0),
             asset_data.get('days_until_maturity', 365),
-            asset_data.get('asset_type_encoded', 0),  # Encoded asset type
+            asset_data.get('asset_type_encoded', ASSET_TYPE_CODES.get(asset_data.get('asset_type'), 0)),
         ])
         
         # Market data
@@ -63,8 +127,10 @@ class RWAPricePredictor:
             asset_data.get('trading_pairs_count', 1),
         ])
         
-        # Time-based features
-        now = datetime.now()
+        # Time-based features (historical records carry their own observation time)
+        now = asset_data.get('observed_at') or datetime.now()
+        if isinstance(now, str):
+            now = datetime.fromisoformat(now)
         features.extend([
             now.hour,
             now.weekday(),
@@ -104,23 +170,130 @@ class RWAPricePredictor:
             'rsi', 'moving_avg_ratio_7d', 'moving_avg_ratio_30d', 'bollinger_position'
         ]
     
-    def train(self, training_data: List[Dict]) -> Dict:
-        """Train the model on historical data"""
+    def build_training_matrix(self, training_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Build the feature matrix and target vector from raw training records"""
+        X = []
+        y = []
+        
+        for data_point in training_data:
+            features = self.prepare_features(data_point)
+            X.append(features.flatten())
+            y.append(data_point['target_price'])
+        
+        return np.array(X), np.array(y)
+    
+    def _parallel_budget(self, n_jobs: Optional[int] = None) -> Tuple[int, int]:
+        """Split available cores into (process workers, threads per worker)"""
+        if n_jobs is not None:
+            return max(1, n_jobs), 1
+        cpu_count = os.cpu_count() or 1
+        threads_per_worker = max(1, min(settings.TRAIN_THREADS_PER_WORKER, cpu_count))
+        n_workers = max(1, min(settings.TRAIN_N_WORKERS, cpu_count // threads_per_worker))
+        return n_workers, threads_per_worker
+    
+    def _build_pipeline(self, threads_per_worker: int):
+        """Scaler + forest pipeline so every CV fold fits its own scaler"""
+        from sklearn.base import clone
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import StandardScaler
+        
+        model = clone(self.model).set_params(n_jobs=threads_per_worker)
+        return Pipeline([
+            ('scaler', StandardScaler()),
+            ('model', model)
+        ])
+    
+    def tune_hyperparameters(self, X: np.ndarray, y: np.ndarray,
+                             param_grid: Optional[Dict[str, List]] = None) -> Dict:
+        """Successive-halving search over forest hyperparameters in a process pool"""
+        from joblib import parallel_backend
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.model_selection import HalvingGridSearchCV
+        
+        n_workers, threads_per_worker = self._parallel_budget()
+        grid = param_grid or self.DEFAULT_PARAM_GRID
+        
+        search = HalvingGridSearchCV(
+            self._build_pipeline(threads_per_worker),
+            {f"model__{name}": values for name, values in grid.items()},
+            factor=settings.TUNING_HALVING_FACTOR,
+            cv=settings.TRAIN_CV_FOLDS,
+            scoring='neg_mean_squared_error',
+            n_jobs=n_workers,
+            random_state=42,
+            # Keep halving until the last round runs on (nearly) all the rows
+            aggressive_elimination=True,
+            refit=False
+        )
+        
+        started = time.perf_counter()
+        # Cap the threads each loky worker may use so folds x trees never oversubscribe cores
+        with parallel_backend('loky', inner_max_num_threads=threads_per_worker):
+            search.fit(X, y)
+        search_wall_time = time.perf_counter() - started
+        
+        # Aggregate fit + score time per candidate across all halving rounds it survived
+        results = search.cv_results_
+        candidates: Dict[str, Dict] = {}
+        for i, params in enumerate(results['params']):
+            key = repr(sorted(params.items()))
+            candidate = candidates.setdefault(key, {
+                'params': {name.replace('model__', ''): value for name, value in params.items()},
+                'rounds': 0,
+                'wall_time_s': 0.0
+            })
+            candidate['rounds'] += 1
+            candidate['wall_time_s'] += float(
+                (results['mean_fit_time'][i] + results['mean_score_time'][i]) * search.n_splits_
+            )
+            candidate['n_resources'] = int(results['n_resources'][i])
+            candidate['cv_rmse'] = float(np.sqrt(-results['mean_test_score'][i]))
+        
+        ranked = sorted(
+            candidates.values(),
+            key=lambda c: (-c['rounds'], c['cv_rmse'])
+        )
+        for candidate in ranked:
+            candidate['wall_time_s'] = round(candidate['wall_time_s'], 4)
+        
+        best_params = {name.replace('model__', ''): value for name, value in search.best_params_.items()}
+        
+        logger.info(
+            f"Hyperparameter search finished in {search_wall_time:.2f}s "
+            f"({len(ranked)} candidates, {n_workers} workers x {threads_per_worker} threads). "
+            f"Best: {best_params}"
+        )
+        
+        return {
+            'best_params': best_params,
+            # Scored on the last round's subsample only; train() re-runs CV on the full split
+            'halving_cv_rmse': float(np.sqrt(-search.best_score_)),
+            'halving_n_resources': int(search.n_resources_[-1]),
+            'n_candidates': len(ranked),
+            'n_rounds': int(search.n_iterations_),
+            'n_workers': n_workers,
+            'threads_per_worker': threads_per_worker,
+            'wall_time_s': round(search_wall_time, 4),
+            'candidates': ranked
+        }
+    
+    def train(self, training_data: List[Dict], tune: bool = False, n_jobs: Optional[int] = None) -> Dict:
+        """Train the model on historical data (n_jobs overrides the CV process pool size)"""
+        from joblib import parallel_backend
+        from sklearn.model_selection import train_test_split, cross_val_score
+        from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+        from sklearn.preprocessing import StandardScaler
+        
         try:
             if len(training_data) < settings.MIN_TRAINING_SAMPLES:
                 raise ValueError(f"Insufficient training data. Need at least {settings.MIN_TRAINING_SAMPLES} samples")
             
-            # Prepare features and targets
-            X = []
-            y = []
-            
-            for data_point in training_data:
-                features = self.prepare_features(data_point)
-                X.append(features.flatten())
-                y.append(data_point['target_price'])
+            # Always a fresh forest: a loaded model is compact, and tuned params must not carry over
+            self.model = self._new_forest()
+            self.scaler = StandardScaler()
             
-            X = np.array(X)
-            y = np.array(y)
+            # Prepare features and targets
+            X, y = self.build_training_matrix(training_data)
             
             # Store feature names
             self.feature_columns = self.generate_feature_names()
@@ -130,9 +303,36 @@ class RWAPricePredictor:
                 X, y, test_size=0.2, random_state=42
             )
             
+            # Optional hyperparameter search on the unscaled training split
+            tuning = None
+            if tune:
+                tuning = self.tune_hyperparameters(X_train, y_train)
+                self.model.set_params(**tuning['best_params'])
+            
+            # Cross-validation (scaler refit inside each fold, folds run in a process pool)
+            n_workers, threads_per_worker = self._parallel_budget(n_jobs)
+            with parallel_backend('loky', inner_max_num_threads=threads_per_worker):
+                cv_scores = cross_val_score(
+                    self._build_pipeline(threads_per_worker), X_train, y_train,
+                    cv=settings.TRAIN_CV_FOLDS, scoring='neg_mean_squared_error',
+                    n_jobs=n_workers
+                )
+            cv_rmse = np.sqrt(-cv_scores.mean())
+            
+            # Trees are pruned at save time on a split the forest never trains on,
+            # so neither the selection nor the test metrics see each other's rows
+            self.prune_set = None
+            X_prune = None
+            if settings.MODEL_COMPACT_ON_SAVE and settings.MODEL_PRUNE_TOLERANCE > 0:
+                X_train, X_prune, y_train, y_prune = train_test_split(
+                    X_train, y_train, test_size=settings.MODEL_PRUNE_FRACTION, random_state=42
+                )
+            
             # Scale features
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
+            if X_prune is not None:
+                self.prune_set = (self.scaler.transform(X_prune), y_prune)
             
             # Train model
             self.model.fit(X_train_scaled, y_train)
@@ -145,12 +345,14 @@ class RWAPricePredictor:
             mae = mean_absolute_error(y_test, y_pred)
             r2 = r2_score(y_test, y_pred)
             
-            # Cross-validation
-            cv_scores = cross_val_score(
-                self.model, X_train_scaled, y_train, 
-                cv=5, scoring='neg_mean_squared_error'
+            # Held-out split is reused to report compaction accuracy at save time
+            self.validation_set = (X_test_scaled, y_test)
+            
+            # Raw training distribution, saved with the model for drift monitoring
+            self.drift_snapshot = build_reference_snapshot(
+                X_train, self.feature_columns,
+                exclude_features=self.TIME_FEATURES + self.UNSERVED_FEATURES
             )
-            cv_rmse = np.sqrt(-cv_scores.mean())
             
             # Feature importance
             self.feature_importance = dict(zip(
@@ -171,6 +373,9 @@ class RWAPricePredictor:
                 'feature_importance': self.feature_importance
             }
             
+            if tuning is not None:
+                metrics['hyperparameter_search'] = tuning
+            
             logger.info(f"Model trained successfully. RMSE: {rmse:.4f}, R2: {r2:.4f}")
             
             return metrics
@@ -185,14 +390,17 @@ class RWAPricePredictor:
             raise ValueError("Model is not trained yet")
         
         try:
-            features = self.prepare_features(asset_data)
-            features_scaled = self.scaler.transform(features)
+            with stage("prepare_features"):
+                features = self.prepare_features(asset_data)
+                features_scaled = self.scaler.transform(features)
             
             # Get prediction from base model
-            predicted_price = self.model.predict(features_scaled)[0]
+            with stage("model_predict"):
+                predicted_price = self.model.predict(features_scaled)[0]
             
             # Calculate confidence score based on feature similarity to training data
-            confidence_score = self.calculate_confidence(features_scaled)
+            with stage("confidence"):
+                confidence_score = self.calculate_confidence(features_scaled)
             
             return float(predicted_price), float(confidence_score)
             
@@ -200,14 +408,44 @@ class RWAPricePredictor:
             logger.error(f"Error making prediction: {str(e)}")
             raise
     
+    def fit(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Fit scaler and forest on a prepared feature matrix (no split or CV; used by backtests)"""
+        from sklearn.preprocessing import StandardScaler
+        
+        self.model = self._new_forest()
+        self.scaler = StandardScaler()
+        self.model.fit(self.scaler.fit_transform(X), y)
+        # No held-out splits here, so save_model compacts without pruning
+        self.validation_set = None
+        self.prune_set = None
+        self.feature_columns = self.generate_feature_names()
+        self.feature_importance = dict(zip(self.feature_columns, self.model.feature_importances_))
+        self.is_trained = True
+        self.last_trained = datetime.now()
+    
+    def predict_batch(self, X: np.ndarray, return_variance: bool = False) -> Tuple[np.ndarray, ...]:
+        """Predict prices and confidence scores (and optionally per-tree variance) for a raw feature matrix"""
+        if not self.is_trained:
+            raise ValueError("Model is not trained yet")
+        
+        tree_predictions = self.tree_predictions(self.scaler.transform(X))
+        mean_pred = tree_predictions.mean(axis=1)
+        variance = tree_predictions.var(axis=1)
+        
+        # Same coefficient-of-variation confidence as calculate_confidence, vectorized
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coefficient_of_variation = np.where(mean_pred != 0, np.sqrt(variance) / np.abs(mean_pred), 1.0)
+        confidence = np.clip(1 - coefficient_of_variation, 0, 1)
+        
+        if return_variance:
+            return mean_pred, confidence, variance
+        return mean_pred, confidence
+    
     def calculate_confidence(self, features: np.ndarray) -> float:
         """Calculate confidence score based on prediction variance"""
         try:
             # Use individual tree predictions to calculate variance
-            tree_predictions = [
-                tree.predict(features)[0] 
-                for tree in self.model.estimators_
-            ]
+            tree_predictions = self.tree_predictions(features)[0]
             
             variance = np.var(tree_predictions)
             mean_pred = np.mean(tree_predictions)
@@ -223,38 +461,71 @@ class RWAPricePredictor:
             logger.error(f"Error calculating confidence: {str(e)}")
             return 0.5  # Return neutral confidence on error
     
+    def tree_predictions(self, features: np.ndarray) -> np.ndarray:
+        """Per-tree predictions for scaled features, shape (n_samples, n_trees)"""
+        if isinstance(self.model, CompactForest):
+            return self.model.predict_trees(features)
+        return np.column_stack([tree.predict(features) for tree in self.model.estimators_])
+    
     def get_feature_importance(self) -> Dict[str, float]:
         """Get feature importance from trained model"""
         if not self.is_trained:
             return {}
         return self.feature_importance
     
-    def save_model(self, filepath: str) -> None:
-        """Save trained model to file"""
+    def save_model(self, filepath: str, compact: Optional[bool] = None) -> Dict:
+        """Save trained model to file (compact float32 format unless compact=False)"""
         if not self.is_trained:
             raise ValueError("Cannot save untrained model")
         
+        if compact is None:
+            compact = settings.MODEL_COMPACT_ON_SAVE
+        
         model_data = {
-            'model': self.model,
             'scaler': self.scaler,
             'feature_columns': self.feature_columns,
             'last_trained': self.last_trained,
-            'feature_importance': self.feature_importance
+            'feature_importance': self.feature_importance,
+            'drift_snapshot': self.drift_snapshot
         }
         
-        joblib.dump(model_data, filepath)
+        report = {}
+        if isinstance(self.model, CompactForest):
+            model_data.update({'format': COMPACT_FORMAT, 'forest': self.model.to_arrays()})
+        elif compact:
+            X_val, y_val = self.validation_set if self.validation_set is not None else (None, None)
+            X_prune, y_prune = self.prune_set if self.prune_set is not None else (None, None)
+            compact_model, report = compact_forest(
+                self.model, X_val, y_val,
+                prune_tolerance=settings.MODEL_PRUNE_TOLERANCE,
+                min_trees=settings.MODEL_PRUNE_MIN_TREES,
+                X_prune=X_prune, y_prune=y_prune
+            )
+            model_data.update({'format': COMPACT_FORMAT, 'forest': compact_model.to_arrays()})
+        else:
+            model_data['model'] = self.model
+        
+        # Uncompressed so compact arrays can be memory-mapped (and shared) on load
+        atomic_dump(model_data, filepath)
+        self.compaction_report = report
         logger.info(f"Model saved to {filepath}")
+        
+        return report
     
     def load_model(self, filepath: str) -> None:
         """Load trained model from file"""
         try:
-            model_data = joblib.load(filepath)
+            model_data = joblib.load(filepath, mmap_mode='r')
             
-            self.model = model_data['model']
+            if model_data.get('format') == COMPACT_FORMAT:
+                self.model = CompactForest.from_arrays(model_data['forest'])
+            else:
+                self.model = model_data['model']
             self.scaler = model_data['scaler']
             self.feature_columns = model_data['feature_columns']
             self.last_trained = model_data['last_trained']
             self.feature_importance = model_data['feature_importance']
+            self.drift_snapshot = model_data.get('drift_snapshot')
             self.is_trained = True
             
             logger.info(f"Model loaded from {filepath}")
@@ -265,7 +536,8 @@ class RWAPricePredictor:
 
 
 class RiskScorer:
-    def __init__(self):
+    def __init__(self, use_price_impact: Optional[bool] = None):
+        self.use_price_impact = settings.RISK_USE_PRICE_IMPACT if use_price_impact is None else use_price_impact
         self.weights = {
             'liquidity_risk': settings.LIQUIDITY_WEIGHT,
             'volatility_risk': settings.VOLATILITY_WEIGHT,
@@ -290,6 +562,15 @@ class RiskScorer:
                 volume_ratio = volume_24h / total_liquidity
                 liquidity_risk = max(0, min(100, 100 - (volume_ratio * 1000)))
             
+            # Blend in pool depth: slippage of a reference buy against the AMM reserves
+            if self.use_price_impact:
+                slippage = reference_slippage(
+                    asset_data.get('liquidity_reserve0', 0),
+                    asset_data.get('liquidity_reserve1', 0)
+                )
+                impact_risk = 100 if slippage is None else min(100, slippage / settings.RISK_MAX_RISK_SLIPPAGE * 100)
+                liquidity_risk = (liquidity_risk + impact_risk) / 2
+            
             risk_components['liquidity_risk'] = liquidity_risk
             
             # Volatility Risk
@@ -382,33 +663,41 @@ class RiskScorer:
 
 
 class AnomalyDetector:
+    FEATURE_NAMES: List[str] = [
+        'volume_24h', 'price_change_24h', 'price_volatility_30d',
+        'transaction_count_24h', 'holder_count', 'liquidity_depth'
+    ]
+    
+    # Not a field of the serving API's AssetData, so it is not drift-checked
+    UNSERVED_FEATURES: List[str] = ['liquidity_depth']
+    
     def __init__(self):
-        self.model = IsolationForest(
-            contamination=0.1,  # Expect 10% anomalies
-            random_state=42
-        )
+        # Built on first train() or load_model()
+        self.model = None
         self.is_trained = False
+        self.drift_snapshot: Optional[Dict] = None
+    
+    def prepare_features(self, asset_data: Dict) -> List[float]:
+        """Extract the anomaly detection feature vector"""
+        return [asset_data.get(name, 0) for name in self.FEATURE_NAMES]
     
     def train(self, normal_data: List[Dict]) -> None:
         """Train anomaly detection model on normal market data"""
+        from sklearn.ensemble import IsolationForest
+        
         try:
             # Prepare features for anomaly detection
-            features = []
-            
-            for data in normal_data:
-                feature_vector = [
-                    data.get('volume_24h', 0),
-                    data.get('price_change_24h', 0),
-                    data.get('price_volatility_30d', 0),
-                    data.get('transaction_count_24h', 0),
-                    data.get('holder_count', 0),
-                    data.get('liquidity_depth', 0)
-                ]
-                features.append(feature_vector)
-            
-            X = np.array(features)
+            X = np.array([self.prepare_features(data) for data in normal_data])
+            self.model = IsolationForest(
+                contamination=0.1,  # Expect 10% anomalies
+                random_state=42
+            )
             self.model.fit(X)
             self.is_trained = True
+            self.drift_snapshot = build_reference_snapshot(
+                X, self.FEATURE_NAMES,
+                exclude_features=self.UNSERVED_FEATURES
+            )
             
             logger.info(f"Anomaly detector trained on {len(normal_data)} samples")
             
@@ -422,16 +711,7 @@ class AnomalyDetector:
             return {'is_anomaly': False, 'confidence': 0.0, 'error': 'Model not trained'}
         
         try:
-            feature_vector = [
-                asset_data.get('volume_24h', 0),
-                asset_data.get('price_change_24h', 0),
-                asset_data.get('price_volatility_30d', 0),
-                asset_data.get('transaction_count_24h', 0),
-                asset_data.get('holder_count', 0),
-                asset_data.get('liquidity_depth', 0)
-            ]
-            
-            X = np.array(feature_vector).reshape(1, -1)
+            X = np.array(self.prepare_features(asset_data)).reshape(1, -1)
             
             # Predict anomaly (-1 = anomaly, 1 = normal)
             prediction = self.model.predict(X)[0]
@@ -442,7 +722,7 @@ class AnomalyDetector:
             confidence = abs(anomaly_score)  # Higher absolute score = higher confidence
             
             return {
-                'is_anomaly': is_anomaly,
+                'is_anomaly': bool(is_anomaly),
                 'anomaly_score': float(anomaly_score),
                 'confidence': float(confidence),
                 'risk_level': 'High' if is_anomaly else 'Normal'
@@ -450,4 +730,27 @@ class AnomalyDetector:
             
         except Exception as e:
             logger.error(f"Error detecting anomaly: {str(e)}")
-            return {'is_anomaly': False, 'confidence': 0.0, 'error': str(e)}
\ No newline at end of file
+            return {'is_anomaly': False, 'confidence': 0.0, 'error': str(e)}
+    
+    def save_model(self, filepath: str) -> None:
+        """Save trained detector to file"""
+        if not self.is_trained:
+            raise ValueError("Cannot save untrained model")
+        
+        atomic_dump({'model': self.model, 'drift_snapshot': self.drift_snapshot}, filepath)
+        logger.info(f"Anomaly detector saved to {filepath}")
+    
+    def load_model(self, filepath: str) -> None:
+        """Load trained detector from file"""
+        try:
+            model_data = joblib.load(filepath)
+            
+            self.model = model_data['model']
+            self.drift_snapshot = model_data.get('drift_snapshot')
+            self.is_trained = True
+            
+            logger.info(f"Anomaly detector loaded from {filepath}")
+            
+        except Exception as e:
+            logger.error(f"Error loading anomaly detector: {str(e)}")
+            raise
@@ -0,0 +1,259 @@
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+import logging
+from models.price_predictor import RiskScorer
+
+logger = logging.getLogger(__name__)
+
+# AssetData fields that feed RiskScorer; a token is re-scored only when one of them changes
+RISK_INPUT_FIELDS: Tuple[str, ...] = (
+    'asset_type', 'yield_rate', 'volume_24h', 'total_liquidity', 'price_volatility_30d',
+    'market_cap', 'compliance_required', 'jurisdiction', 'liquidity_reserve0', 'liquidity_reserve1'
+)
+
+NUMERIC_COLUMNS: Tuple[str, ...] = (
+    'risk_score', 'yield_rate', 'current_price', 'market_cap', 'total_liquidity', 'volume_24h', 'updated_at'
+)
+CATEGORICAL_COLUMNS: Tuple[str, ...] = ('asset_type', 'jurisdiction', 'risk_category')
+TEXT_COLUMNS: Tuple[str, ...] = ('token_address', 'name', 'symbol')
+
+# Columns with a maintained sort order, usable both for range filters and ordering
+INDEXED_COLUMNS: Tuple[str, ...] = ('risk_score', 'yield_rate')
+
+# Writes patch built indexes in place (O(rows) each); larger batches re-sort once on the next query
+INDEX_REBUILD_BATCH = 64
+
+
+class RiskScreener:
+    """Columnar in-memory table of risk scores and key AssetData fields.
+
+    Rows are stored in growable numpy columns (categoricals as integer
+    codes). Sorted indexes on risk_score and yield_rate are built lazily and
+    then patched in place on single-row writes, so queries only
+    binary-search and mask small arrays.
+    """
+
+    def __init__(self, risk_scorer: Optional[RiskScorer] = None, initial_capacity: int = 1024):
+        self.risk_scorer = risk_scorer or RiskScorer()
+        self._lock = threading.Lock()
+        self._capacity = initial_capacity
+        self._size = 0
+        self._rows: Dict[str, int] = {}
+        self._fingerprints: List[Optional[tuple]] = []
+        self._active = np.zeros(initial_capacity, dtype=bool)
+        self._numeric = {name: np.zeros(initial_capacity) for name in NUMERIC_COLUMNS}
+        self._codes = {name: np.zeros(initial_capacity, dtype=np.int32) for name in CATEGORICAL_COLUMNS}
+        self._vocab: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self._labels: Dict[str, List[str]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._text: Dict[str, List[str]] = {name: [] for name in TEXT_COLUMNS}
+        self._indexes: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return int(self._active[:self._size].sum())
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        self._active = np.resize(self._active, self._capacity)
+        self._active[self._size:] = False
+        for columns in (self._numeric, self._codes):
+            for name, column in columns.items():
+                columns[name] = np.resize(column, self._capacity)
+
+    def _code(self, column: str, label: str) -> int:
+        vocab = self._vocab[column]
+        if label not in vocab:
+            vocab[label] = len(vocab)
+            self._labels[column].append(label)
+        return vocab[label]
+
+    def _write_row(self, asset_data: Dict, risk_analysis: Dict, fingerprint: tuple) -> None:
+        token = asset_data['token_address']
+        row = self._rows.get(token)
+        previous = self._indexed_values(row)
+        if row is None:
+            if self._size == self._capacity:
+                self._grow()
+            row = self._size
+            self._size += 1
+            self._rows[token] = row
+            self._fingerprints.append(None)
+            for name in TEXT_COLUMNS:
+                self._text[name].append('')
+
+        self._fingerprints[row] = fingerprint
+        self._active[row] = True
+        for name in TEXT_COLUMNS:
+            self._text[name][row] = asset_data.get(name, '')
+
+        values = {**asset_data, 'risk_score': risk_analysis['overall_risk_score'], 'updated_at': time.time()}
+        for name in NUMERIC_COLUMNS:
+            self._numeric[name][row] = values.get(name) or 0
+        self._codes['asset_type'][row] = self._code('asset_type', asset_data.get('asset_type', 'UNKNOWN'))
+        self._codes['jurisdiction'][row] = self._code('jurisdiction', asset_data.get('jurisdiction', 'UNKNOWN'))
+        self._codes['risk_category'][row] = self._code('risk_category', risk_analysis['risk_category'])
+
+        self._reindex_row(row, previous)
+
+    def _indexed_values(self, row: Optional[int]) -> Dict[str, float]:
+        """Current values of an active row in each built index (empty for new or removed rows)"""
+        if row is None or not self._active[row]:
+            return {}
+        return {column: self._numeric[column][row] for column in self._indexes}
+
+    def _reindex_row(self, row: int, previous: Dict[str, float]) -> None:
+        """Move one row to its new position in each built index instead of re-sorting"""
+        for column, (order, values) in list(self._indexes.items()):
+            value = self._numeric[column][row]
+            if self._active[row] and column in previous and previous[column] == value:
+                continue
+
+            if column in previous:
+                start = np.searchsorted(values, previous[column], side='left')
+                end = np.searchsorted(values, previous[column], side='right')
+                matches = np.flatnonzero(order[start:end] == row)
+                if len(matches) == 0:
+                    # Not where its old value says (e.g. NaN); fall back to a lazy rebuild
+                    del self._indexes[column]
+                    continue
+                position = start + int(matches[0])
+                order, values = np.delete(order, position), np.delete(values, position)
+
+            if self._active[row]:
+                position = np.searchsorted(values, value, side='right')
+                order, values = np.insert(order, position, row), np.insert(values, position, value)
+
+            self._indexes[column] = (order, values)
+
+    def upsert(self, assets: List[Dict]) -> Dict[str, int]:
+        """Add or refresh tokens, re-scoring only those whose risk inputs changed"""
+        updated = 0
+        failed = 0
+        with self._lock:
+            if len(assets) > INDEX_REBUILD_BATCH:
+                self._indexes.clear()
+            for asset_data in assets:
+                fingerprint = tuple(asset_data.get(name) for name in RISK_INPUT_FIELDS)
+                row = self._rows.get(asset_data['token_address'])
+
+                if row is not None and self._active[row] and self._fingerprints[row] == fingerprint:
+                    # Risk is unchanged; only refresh the market fields shown in results
+                    self._numeric['current_price'][row] = asset_data.get('current_price') or 0
+                    continue
+
+                risk_analysis = self.risk_scorer.calculate_risk_score(asset_data)
+                if 'error' in risk_analysis:
+                    # Keep any earlier row; its fingerprint no longer matches, so the next upsert retries
+                    failed += 1
+                    continue
+                self._write_row(asset_data, risk_analysis, fingerprint)
+                updated += 1
+
+        if failed:
+            logger.warning(f"Risk scoring failed for {failed} of {len(assets)} screened tokens")
+        return {'updated': updated, 'unchanged': len(assets) - updated - failed, 'failed': failed, 'total': len(self)}
+
+    def record(self, asset_data: Dict, risk_analysis: Dict) -> None:
+        """Store a risk score that was already computed (e.g. by /api/ai/risk-score)"""
+        # RiskScorer's fallback on failure is a placeholder Medium score, not a result to screen on
+        if 'error' in risk_analysis:
+            return
+        fingerprint = tuple(asset_data.get(name) for name in RISK_INPUT_FIELDS)
+        with self._lock:
+            self._write_row(asset_data, risk_analysis, fingerprint)
+
+    def remove(self, token_address: str) -> bool:
+        with self._lock:
+            row = self._rows.get(token_address)
+            if row is None or not self._active[row]:
+                return False
+            previous = self._indexed_values(row)
+            self._active[row] = False
+            self._reindex_row(row, previous)
+            return True
+
+    def _index(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(row ids, values) of active rows sorted ascending by column"""
+        if column not in self._indexes:
+            rows = np.flatnonzero(self._active[:self._size])
+            order = rows[np.argsort(self._numeric[column][rows], kind='stable')]
+            self._indexes[column] = (order, self._numeric[column][order])
+        return self._indexes[column]
+
+    def _category_mask(self, rows: np.ndarray, column: str, labels: Optional[List[str]]) -> Optional[np.ndarray]:
+        if not labels:
+            return None
+        # Lookup table over the (small) vocabulary is cheaper than np.isin
+        allowed = np.zeros(len(self._vocab[column]) + 1, dtype=bool)
+        allowed[[self._vocab[column][label] for label in labels if label in self._vocab[column]]] = True
+        return allowed[self._codes[column][rows]]
+
+    def query(self, asset_types: Optional[List[str]] = None, jurisdictions: Optional[List[str]] = None,
+              risk_categories: Optional[List[str]] = None, min_risk_score: Optional[float] = None,
+              max_risk_score: Optional[float] = None, min_yield_rate: Optional[float] = None,
+              max_yield_rate: Optional[float] = None, sort_by: str = 'risk_score',
+              descending: bool = False, limit: int = 50) -> List[Dict]:
+        """Filter, sort and take the top `limit` rows (yield_rate bounds are in bps, inclusive)"""
+        if sort_by not in NUMERIC_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort_by}. Expected one of {NUMERIC_COLUMNS}")
+
+        with self._lock:
+            # Drive the scan from an index range; yield is usually the more selective bound
+            bounds = {
+                'yield_rate': (min_yield_rate, max_yield_rate),
+                'risk_score': (min_risk_score, max_risk_score)
+            }
+            if bounds['yield_rate'] != (None, None):
+                driver = 'yield_rate'
+            elif bounds['risk_score'] != (None, None):
+                driver = 'risk_score'
+            else:
+                driver = sort_by if sort_by in INDEXED_COLUMNS else 'risk_score'
+            low, high = bounds[driver]
+
+            order, values = self._index(driver)
+            start = 0 if low is None else np.searchsorted(values, low, side='left')
+            end = len(values) if high is None else np.searchsorted(values, high, side='right')
+            rows = order[start:end]
+
+            # Remaining predicates are masks over the (already narrowed) candidate rows
+            mask = np.ones(len(rows), dtype=bool)
+            if driver != 'risk_score':
+                risk = self._numeric['risk_score'][rows]
+                if min_risk_score is not None:
+                    mask &= risk >= min_risk_score
+                if max_risk_score is not None:
+                    mask &= risk <= max_risk_score
+            for column, labels in (('asset_type', asset_types), ('jurisdiction', jurisdictions),
+                                   ('risk_category', risk_categories)):
+                column_mask = self._category_mask(rows, column, labels)
+                if column_mask is not None:
+                    mask &= column_mask
+            rows = rows[mask]
+
+            # Rows are already ordered when sorting by the driving index; otherwise partial-sort for top-k
+            if sort_by == driver:
+                rows = rows[::-1][:limit] if descending else rows[:limit]
+            else:
+                keys = self._numeric[sort_by][rows]
+                if descending:
+                    keys = -keys
+                if len(rows) > limit:
+                    top = np.argpartition(keys, limit - 1)[:limit]
+                    rows, keys = rows[top], keys[top]
+                rows = rows[np.argsort(keys, kind='stable')]
+
+            return self._row_dicts(rows)
+
+    def _row_dicts(self, rows: np.ndarray) -> List[Dict]:
+        """Materialize result rows column by column"""
+        row_ids = rows.tolist()
+        names = list(TEXT_COLUMNS) + list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS)
+        columns = [[self._text[name][row] for row in row_ids] for name in TEXT_COLUMNS]
+        columns += [self._numeric[name][rows].tolist() for name in NUMERIC_COLUMNS]
+        columns += [
+            [self._labels[name][code] for code in self._codes[name][rows].tolist()]
+            for name in CATEGORICAL_COLUMNS
+        ]
+        return [dict(zip(names, values)) for values in zip(*columns)]
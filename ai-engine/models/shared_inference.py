@@ -0,0 +1,175 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Optional, Tuple
+import numpy as np
+import logging
+from config import settings
+from models.price_predictor import RWAPricePredictor
+
+logger = logging.getLogger(__name__)
+
+# Columns of the shared output buffer, one row per input row
+OUTPUT_COLUMNS: Tuple[str, ...] = ('predicted_price', 'confidence', 'variance')
+
+# Worker process state: the model loaded once by the pool initializer and the
+# segments currently attached, keyed by role ('features' / 'output')
+_worker_predictor: Optional[RWAPricePredictor] = None
+_worker_segments: Dict[str, SharedMemory] = {}
+
+
+def _init_worker(model_path: str) -> None:
+    global _worker_predictor
+    _worker_predictor = RWAPricePredictor(n_jobs=1)
+    _worker_predictor.load_model(model_path)
+
+
+def _attach(role: str, name: str) -> memoryview:
+    """Buffer of the parent's segment, re-attaching only when the parent reallocated it"""
+    segment = _worker_segments.get(role)
+    if segment is None or segment.name != name:
+        if segment is not None:
+            segment.close()
+        try:
+            # The parent owns and unlinks the segment, so workers must not track it (3.13+)
+            segment = SharedMemory(name=name, track=False)
+        except TypeError:
+            segment = SharedMemory(name=name)
+        _worker_segments[role] = segment
+    return segment.buf
+
+
+def _score_rows(features_name: str, output_name: str, n_rows: int, n_features: int, start: int, end: int) -> int:
+    """Score rows [start, end) in place (runs inside a worker process)"""
+    features = np.ndarray((n_rows, n_features), dtype=np.float64, buffer=_attach('features', features_name))
+    output = np.ndarray((n_rows, len(OUTPUT_COLUMNS)), dtype=np.float64, buffer=_attach('output', output_name))
+
+    predictions, confidence, variance = _worker_predictor.predict_batch(features[start:end], return_variance=True)
+    output[start:end, 0] = predictions
+    output[start:end, 1] = confidence
+    output[start:end, 2] = variance
+    return end - start
+
+
+class SharedMemoryInference:
+    """Batch price scoring on a process pool whose workers each hold the saved model.
+
+    The parent copies the N x F feature matrix into a shared memory segment;
+    tasks carry only segment names and row bounds, workers read their slice
+    in place and write predictions, confidence and per-tree variance into a
+    shared output segment. No arrays are pickled in either direction, so
+    throughput scales with the number of workers instead of the GIL.
+    """
+
+    def __init__(self, model_path: Optional[str] = None, n_workers: Optional[int] = None,
+                 chunk_rows: Optional[int] = None):
+        self.model_path = model_path or settings.PRICE_MODEL_PATH
+        self.n_workers = max(1, n_workers or settings.INFERENCE_N_WORKERS)
+        self.chunk_rows = max(1, chunk_rows or settings.INFERENCE_CHUNK_ROWS)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._model_mtime: Optional[float] = None
+        self._segments: Dict[str, SharedMemory] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        """Running pool, restarted whenever the saved model file changes"""
+        if not os.path.exists(self.model_path):
+            raise ValueError(f"No saved model at {self.model_path}")
+
+        model_mtime = os.path.getmtime(self.model_path)
+        if self._executor is None or model_mtime != self._model_mtime:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            # spawn rather than fork: the service process runs threads (event loop, drift checks)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_path,)
+            )
+            self._model_mtime = model_mtime
+            logger.info(f"Started {self.n_workers} inference workers for {self.model_path}")
+        return self._executor
+
+    def _segment(self, role: str, nbytes: int) -> SharedMemory:
+        segment = self._segments.get(role)
+        if segment is None or segment.size < nbytes:
+            previous_size = 0
+            if segment is not None:
+                previous_size = segment.size
+                segment.close()
+                segment.unlink()
+            # Grow geometrically so a slowly growing universe does not reallocate every batch
+            segment = SharedMemory(create=True, size=max(nbytes, 2 * previous_size))
+            self._segments[role] = segment
+        return segment
+
+    def _chunks(self, n_rows: int) -> np.ndarray:
+        # At least one chunk per worker, and no chunk larger than chunk_rows
+        n_chunks = max(self.n_workers, -(-n_rows // self.chunk_rows))
+        return np.linspace(0, n_rows, min(n_chunks, n_rows) + 1).astype(int)
+
+    def predict(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Predicted price, confidence and per-tree variance for each row of a raw feature matrix"""
+        X = np.asarray(X, dtype=np.float64)
+        n_rows, n_features = X.shape
+        if n_rows == 0:
+            return {name: np.empty(0) for name in OUTPUT_COLUMNS}
+
+        with self._lock:
+            executor = self._pool()
+            features_segment = self._segment('features', X.nbytes)
+            output_segment = self._segment('output', n_rows * len(OUTPUT_COLUMNS) * 8)
+
+            features = np.ndarray(X.shape, dtype=np.float64, buffer=features_segment.buf)
+            features[:] = X
+            del features
+
+            bounds = self._chunks(n_rows)
+            try:
+                self._score(executor, features_segment, output_segment, n_rows, n_features, bounds)
+            except BrokenProcessPool:
+                # A worker died (OOM, signal); rebuild the pool once, and fail if that breaks too
+                logger.warning("Inference worker died; restarting the process pool")
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                executor = self._pool()
+                self._score(executor, features_segment, output_segment, n_rows, n_features, bounds)
+
+            # One local copy out of the segment so it can be reused by the next batch
+            output = np.ndarray((n_rows, len(OUTPUT_COLUMNS)), dtype=np.float64, buffer=output_segment.buf).copy()
+
+        return {name: output[:, i] for i, name in enumerate(OUTPUT_COLUMNS)}
+
+    @staticmethod
+    def _score(executor: ProcessPoolExecutor, features_segment: SharedMemory, output_segment: SharedMemory,
+               n_rows: int, n_features: int, bounds: np.ndarray) -> None:
+        futures = [
+            executor.submit(_score_rows, features_segment.name, output_segment.name,
+                            n_rows, n_features, int(start), int(end))
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        for future in futures:
+            future.result()
+
+    def get_status(self) -> Dict:
+        return {
+            'running': self._executor is not None,
+            'n_workers': self.n_workers,
+            'chunk_rows': self.chunk_rows,
+            'shared_memory_bytes': sum(segment.size for segment in self._segments.values())
+        }
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory segments"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+            for segment in self._segments.values():
+                segment.close()
+                segment.unlink()
+            self._segments.clear()
@@ -0,0 +1,414 @@
+"""Load-testing harness for the AI engine.
+
+A mock gateway plays the role of the API service: it sends authenticated
+requests with synthetic AssetData to predict-price, risk-score,
+detect-anomaly and portfolio-analysis. Arrivals are open-loop (Poisson at
+a fixed offered rate), so a slow server cannot slow the load down. Latency
+is measured from each request's scheduled send time, which counts time
+spent queued behind the in-flight limit. Throughput counts completions
+within each step's send window and is compared with the rate actually
+drawn for that step, not the nominal one.
+
+A locally started server gets a temporary MODELS_DIR, so --train never
+touches the models saved in ai-engine/models/saved. Training only reaches
+the uvicorn worker that handles the request, so with --server-workers > 1
+the server is trained with one worker and then restarted with all of them.
+Against --url, --train needs a single-worker server for the same reason.
+
+(Not named *_test.py so pytest does not collect it.)
+
+Usage (from ai-engine/):
+    # start a local uvicorn, train on synthetic data, step through offered rates
+    python scripts/loadgen.py run --rates 20,50,100,200 --duration 20 --train 500 --output after.json
+
+    # against an already running instance
+    python scripts/loadgen.py run --url http://localhost:8001 --rates 50 --output before.json
+
+    # check a change against SLOs and a baseline run
+    python scripts/loadgen.py compare before.json after.json --slo-p99-ms 250 --max-regression 0.10
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+AI_ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS: Dict[str, str] = {
+    'predict-price': '/api/ai/predict-price',
+    'risk-score': '/api/ai/risk-score',
+    'detect-anomaly': '/api/ai/detect-anomaly',
+    'portfolio-analysis': '/api/ai/portfolio-analysis',
+}
+
+# Default request mix (weights), roughly what the trading UI generates
+DEFAULT_MIX: Dict[str, float] = {
+    'predict-price': 0.45,
+    'risk-score': 0.30,
+    'detect-anomaly': 0.15,
+    'portfolio-analysis': 0.10,
+}
+
+# Per asset type: (share of universe, price range, yield range bps, 30d volatility range)
+ASSET_PROFILES: Dict[str, Tuple[float, Tuple[float, float], Tuple[float, float], Tuple[float, float]]] = {
+    'RealEstate': (0.35, (50, 500), (300, 900), (0.02, 0.10)),
+    'Bond': (0.25, (95, 105), (200, 1200), (0.005, 0.04)),
+    'Invoice': (0.15, (90, 100), (600, 1800), (0.01, 0.08)),
+    'Commodity': (0.15, (10, 2000), (0, 300), (0.10, 0.45)),
+    'Equipment': (0.10, (20, 300), (400, 1100), (0.05, 0.20)),
+}
+JURISDICTIONS = ['US', 'EU', 'UK', 'CA', 'SG', 'CH', 'GLOBAL']
+
+
+def synthetic_asset(rng: np.random.Generator, index: int) -> Dict:
+    """One realistic AssetData payload"""
+    asset_types = list(ASSET_PROFILES)
+    shares = np.array([ASSET_PROFILES[t][0] for t in asset_types])
+    asset_type = asset_types[rng.choice(len(asset_types), p=shares / shares.sum())]
+    _, price_range, yield_range, volatility_range = ASSET_PROFILES[asset_type]
+
+    price = float(rng.uniform(*price_range))
+    reserve0 = float(rng.lognormal(9, 1.5))
+    volume_7d_avg = float(reserve0 * price * rng.uniform(0.01, 0.3))
+    return {
+        'token_address': f"0x{index:040x}",
+        'name': f"{asset_type} Token {index}",
+        'symbol': f"RW{asset_type[:2].upper()}{index}",
+        'asset_type': asset_type,
+        'total_asset_value': float(rng.lognormal(15, 1.2)),
+        'current_price': price,
+        'volume_24h': float(volume_7d_avg * rng.lognormal(0, 0.5)),
+        'volume_7d_avg': volume_7d_avg,
+        'price_change_24h': float(rng.normal(0, 2)),
+        'price_volatility_30d': float(rng.uniform(*volatility_range)),
+        'yield_rate': float(rng.uniform(*yield_range)),
+        'days_until_maturity': int(rng.integers(30, 3650)),
+        'liquidity_reserve0': reserve0,
+        'liquidity_reserve1': reserve0 * price,
+        'total_liquidity': 2 * reserve0 * price,
+        'holder_count': int(rng.lognormal(5, 1.5)),
+        'transaction_count_24h': int(rng.lognormal(3, 1.2)),
+        'market_cap': float(rng.lognormal(16, 1.5)),
+        'jurisdiction': str(rng.choice(JURISDICTIONS)),
+        'compliance_required': bool(rng.random() < 0.9),
+    }
+
+
+def synthetic_payload(endpoint: str, rng: np.random.Generator, universe: List[Dict]) -> Dict:
+    if endpoint == 'portfolio-analysis':
+        picks = rng.choice(len(universe), size=int(rng.integers(2, 12)), replace=False)
+        assets = [universe[i] for i in picks]
+        return {
+            'assets': assets,
+            'total_value': float(sum(a['current_price'] * rng.uniform(10, 1000) for a in assets)),
+            'user_risk_tolerance': str(rng.choice(['low', 'medium', 'high'])),
+        }
+    return universe[int(rng.integers(len(universe)))]
+
+
+def synthetic_training_data(rng: np.random.Generator, n_samples: int) -> List[Dict]:
+    records = []
+    for i in range(n_samples):
+        asset = synthetic_asset(rng, i)
+        asset['target_price'] = asset['current_price'] * (1 + asset['yield_rate'] / 10000 + rng.normal(0, 0.01))
+        records.append(asset)
+    return records
+
+
+class MockGateway:
+    """Stands in for the API service: authenticated JSON calls to the AI engine"""
+
+    def __init__(self, base_url: str, api_key: str, timeout: float):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={'Authorization': f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+
+    async def call(self, endpoint: str, payload: Dict) -> bool:
+        try:
+            response = await self.client.post(ENDPOINTS[endpoint], json=payload)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def percentile_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        'p50_ms': round(float(p50), 2),
+        'p95_ms': round(float(p95), 2),
+        'p99_ms': round(float(p99), 2),
+        'max_ms': round(float(max(latencies)) * 1000, 2),
+    }
+
+
+async def run_step(gateway: MockGateway, rate: float, duration: float, mix: Dict[str, float],
+                   max_in_flight: int, universe: List[Dict], rng: np.random.Generator) -> Dict:
+    """Offer `rate` requests/s for `duration` seconds and collect per-endpoint latency"""
+    endpoints = list(mix)
+    weights = np.array([mix[e] for e in endpoints])
+    n_requests = max(1, int(rng.poisson(rate * duration)))
+    offsets = np.sort(rng.uniform(0, duration, size=n_requests))
+    choices = rng.choice(len(endpoints), size=n_requests, p=weights / weights.sum())
+
+    in_flight = asyncio.Semaphore(max_in_flight)
+    results: Dict[str, Dict[str, list]] = {e: {'latencies': [], 'errors': [], 'completed_at': []} for e in endpoints}
+
+    async def send(endpoint: str, payload: Dict, scheduled: float) -> None:
+        async with in_flight:
+            ok = await gateway.call(endpoint, payload)
+        finished = time.perf_counter()
+        results[endpoint]['latencies' if ok else 'errors'].append(finished - scheduled)
+        if ok:
+            results[endpoint]['completed_at'].append(finished)
+
+    started = time.perf_counter()
+    tasks = []
+    for offset, choice in zip(offsets, choices):
+        delay = started + offset - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = endpoints[choice]
+        payload = synthetic_payload(endpoint, rng, universe)
+        tasks.append(asyncio.create_task(send(endpoint, payload, started + offset)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    # Throughput only counts completions inside the send window; the drain afterwards
+    # would otherwise let a saturated server look like it kept up
+    window_end = started + duration
+
+    def window_throughput(completed_at: List[float]) -> float:
+        return round(sum(1 for finished in completed_at if finished <= window_end) / duration, 2)
+
+    step = {
+        'offered_rps': rate,
+        'realized_offered_rps': round(n_requests / duration, 2),
+        'duration_s': round(elapsed, 2),
+        'endpoints': {}
+    }
+    all_latencies, all_completed, total_errors = [], [], 0
+    for endpoint, data in results.items():
+        all_latencies += data['latencies']
+        all_completed += data['completed_at']
+        total_errors += len(data['errors'])
+        step['endpoints'][endpoint] = {
+            'requests': len(data['latencies']) + len(data['errors']),
+            'errors': len(data['errors']),
+            'throughput_rps': window_throughput(data['completed_at']),
+            **percentile_summary(data['latencies']),
+        }
+    step['overall'] = {
+        'requests': n_requests,
+        'errors': total_errors,
+        'throughput_rps': window_throughput(all_completed),
+        **percentile_summary(all_latencies),
+    }
+    return step
+
+
+def find_knee(steps: List[Dict], latency_factor: float = 3.0, throughput_ratio: float = 0.9) -> Optional[float]:
+    """First offered rate where throughput stops tracking load or p99 jumps vs. the lightest step"""
+    if not steps or steps[0]['overall']['p99_ms'] is None:
+        return None
+    base_p99 = steps[0]['overall']['p99_ms']
+    for step in steps:
+        overall = step['overall']
+        # Compare with the Poisson-drawn load of the step, not the nominal rate
+        offered = step.get('realized_offered_rps', step['offered_rps'])
+        saturated = overall['throughput_rps'] < throughput_ratio * offered
+        latency_jump = overall['p99_ms'] is None or overall['p99_ms'] > latency_factor * base_p99
+        if saturated or latency_jump:
+            return step['offered_rps']
+    return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, models_dir: str) -> subprocess.Popen:
+    """Launch uvicorn on main:app from the ai-engine directory, saving models under models_dir"""
+    env = {
+        **os.environ,
+        'MODELS_DIR': models_dir,
+        'PRICE_MODEL_PATH': os.path.join(models_dir, 'price_predictor.joblib'),
+        'ANOMALY_MODEL_PATH': os.path.join(models_dir, 'anomaly_detector.joblib'),
+        'ROUTER_MODELS_DIR': os.path.join(models_dir, 'router'),
+    }
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=AI_ENGINE_DIR,
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get('/health/ready')).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.25)
+    raise RuntimeError(f"AI engine at {base_url} not ready after {timeout}s")
+
+
+async def run(args: argparse.Namespace) -> Dict:
+    rng = np.random.default_rng(args.seed)
+    server = None
+    models_dir = None
+    base_url = args.url
+    if base_url is None:
+        port = free_port()
+        models_dir = tempfile.TemporaryDirectory(prefix='load-test-models-')
+        # Only the worker serving train-model would be trained, so train on a single one
+        server = start_server(port, 1 if args.train else args.server_workers, models_dir.name)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        await wait_until_ready(base_url)
+        universe = [synthetic_asset(rng, i) for i in range(args.universe)]
+
+        if args.train:
+            trainer = MockGateway(base_url, args.api_key, args.timeout)
+            response = await trainer.client.post(
+                '/api/ai/train-model', json=synthetic_training_data(rng, args.train), timeout=600
+            )
+            await trainer.close()
+            response.raise_for_status()
+
+            if server is not None and args.server_workers > 1:
+                # Every worker loads the trained models from MODELS_DIR on startup
+                server.terminate()
+                server.wait()
+                server = start_server(port, args.server_workers, models_dir.name)
+                await wait_until_ready(base_url)
+
+        gateway = MockGateway(base_url, args.api_key, args.timeout)
+
+        mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+        steps = []
+        for rate in [float(r) for r in args.rates.split(',')]:
+            step = await run_step(gateway, rate, args.duration, mix, args.max_in_flight, universe, rng)
+            overall = step['overall']
+            print(f"{step['realized_offered_rps']:>8.1f} rps offered  {overall['throughput_rps']:>8.1f} rps achieved  "
+                  f"p50 {overall['p50_ms']} ms  p95 {overall['p95_ms']} ms  p99 {overall['p99_ms']} ms  "
+                  f"errors {overall['errors']}", file=sys.stderr)
+            steps.append(step)
+        await gateway.close()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            models_dir.cleanup()
+
+    return {
+        'target': base_url if args.url else 'local uvicorn',
+        'mix': mix,
+        'max_in_flight': args.max_in_flight,
+        'steps': steps,
+        'saturation_knee_rps': find_knee(steps),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(baseline: Dict, candidate: Dict, slo_p99_ms: float, max_regression: float) -> List[str]:
+    """SLO and regression violations of candidate vs. baseline, matching steps by offered rate"""
+    violations = []
+    baseline_steps = {step['offered_rps']: step for step in baseline['steps']}
+    for step in candidate['steps']:
+        rate = step['offered_rps']
+        for endpoint, stats in step['endpoints'].items():
+            p99 = stats['p99_ms']
+            if p99 is None or p99 > slo_p99_ms:
+                violations.append(f"{rate} rps {endpoint}: p99 {p99} ms exceeds SLO {slo_p99_ms} ms")
+            if stats['errors']:
+                violations.append(f"{rate} rps {endpoint}: {stats['errors']} errors")
+
+            before = baseline_steps.get(rate, {}).get('endpoints', {}).get(endpoint)
+            if before and before['p99_ms'] and p99 and p99 > before['p99_ms'] * (1 + max_regression):
+                violations.append(
+                    f"{rate} rps {endpoint}: p99 regressed {before['p99_ms']} -> {p99} ms "
+                    f"(>{max_regression:.0%})"
+                )
+            before_p99 = before['p99_ms'] if before else '-'
+            print(f"{rate:>8.1f} rps  {endpoint:<20} p99 {str(before_p99):>8} -> {str(p99):>8} ms")
+
+    knee_before, knee_after = baseline.get('saturation_knee_rps'), candidate.get('saturation_knee_rps')
+    print(f"saturation knee: {knee_before} -> {knee_after} rps")
+    if knee_before and knee_after and knee_after < knee_before:
+        violations.append(f"saturation knee dropped from {knee_before} to {knee_after} rps")
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI engine load test")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run a stepped open-loop load test")
+    run_parser.add_argument('--url', help="Target URL (default: start a local uvicorn)")
+    run_parser.add_argument('--api-key', default=os.getenv('AI_ENGINE_API_KEY', 'dev-key-12345'))
+    run_parser.add_argument('--rates', default='10,25,50,100', help="Comma-separated offered rates (req/s)")
+    run_parser.add_argument('--duration', type=float, default=15, help="Seconds per rate step")
+    run_parser.add_argument('--max-in-flight', type=int, default=256, help="Concurrency cap")
+    run_parser.add_argument('--mix', help='JSON endpoint weights, e.g. \'{"predict-price": 1}\'')
+    run_parser.add_argument('--universe', type=int, default=500, help="Synthetic tokens to draw from")
+    run_parser.add_argument('--train', type=int, default=0,
+                            help="Train on N synthetic samples first (with --url, the server must run one worker)")
+    run_parser.add_argument('--server-workers', type=int, default=1)
+    run_parser.add_argument('--timeout', type=float, default=30)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--output', help="Write the JSON report here")
+
+    compare_parser = subparsers.add_parser('compare', help="Check a run against SLOs and a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--slo-p99-ms', type=float, default=250)
+    compare_parser.add_argument('--max-regression', type=float, default=0.10)
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        report = asyncio.run(run(args))
+        output = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output)
+        else:
+            print(output)
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    violations = compare(baseline, candidate, args.slo_p99_ms, args.max_regression)
+    for violation in violations:
+        print(f"FAIL {violation}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
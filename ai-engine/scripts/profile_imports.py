@@ -0,0 +1,76 @@
+"""Import-time profile of the AI engine service.
+
+Runs ``python -X importtime`` on a fresh interpreter and summarizes the
+slowest top-level packages, so startup regressions show up before they
+reach the container health check.
+
+Usage (from ai-engine/):
+    python scripts/profile_imports.py [--module main] [--top 15] [--repeat 3]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+AI_ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """Import the module in a fresh interpreter; returns (wall seconds, [(name, self_us, cumulative_us)])"""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=AI_ENGINE_DIR, capture_output=True, text=True, check=True
+    )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us)))
+
+    return float(result.stdout.strip().splitlines()[-1]), entries
+
+
+def summarize_packages(entries: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Exclusive (self) import time per root package in microseconds; sums to the total"""
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in entries:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+    return packages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile AI engine import time")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages to list")
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh interpreters to run")
+    args = parser.parse_args()
+
+    wall_times = []
+    packages: Dict[str, int] = {}
+    for _ in range(args.repeat):
+        wall_time, entries = run_importtime(args.module)
+        wall_times.append(wall_time)
+        packages = summarize_packages(entries)
+
+    print(f"import {args.module}: median {statistics.median(wall_times) * 1000:.1f} ms "
+          f"over {args.repeat} runs (min {min(wall_times) * 1000:.1f} ms)")
+    print(f"{'package':<32}{'self ms':>10}")
+    for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32}{self_us / 1000:>10.1f}")
+
+    loaded_training_deps = [name for name in packages if name in ("sklearn", "pandas", "scipy")]
+    if loaded_training_deps:
+        print(f"warning: training-only packages imported at startup: {', '.join(loaded_training_deps)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from config import settings
+from models.backtest import PriceHistory, _fit_window, run_backtest, simulate_signals, walk_forward_windows
+
+
+@pytest.fixture(autouse=True)
+def small_forests(monkeypatch):
+    monkeypatch.setattr(settings, "BACKTEST_N_ESTIMATORS", 5)
+    monkeypatch.setattr(settings, "BACKTEST_MAX_DEPTH", 4)
+
+
+def _panel(n_steps: int, n_tokens: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(0.01 * rng.standard_normal((n_steps, n_tokens)), axis=0))
+    features = rng.normal(size=(n_steps, n_tokens, 25)).astype(np.float32)
+    features[:, :, 4] = prices
+    return features, prices
+
+
+def test_walk_forward_windows_stop_where_targets_run_out():
+    assert walk_forward_windows(10, train_window=4, test_window=3, horizon=2) == [(4, 7), (7, 8)]
+    assert walk_forward_windows(10, train_window=8, test_window=5, horizon=1) == [(8, 9)]
+    assert walk_forward_windows(10, train_window=9, test_window=5, horizon=1) == []
+
+
+def test_fit_window_uses_no_data_after_start():
+    features, prices = _panel(40, 6)
+    start, train_window, horizon = 25, 20, 3
+    expected = _fit_window(features, prices, start, train_window, horizon)
+
+    # Features after start - horizon have no observed target yet, prices after start are the future
+    poisoned_features, poisoned_prices = features.copy(), prices.copy()
+    poisoned_features[start - horizon + 1:] = 1e6
+    poisoned_prices[start + 1:] = -1e6
+    actual = _fit_window(poisoned_features, poisoned_prices, start, train_window, horizon)
+
+    X = features[start].astype(np.float64)
+    np.testing.assert_array_equal(actual.predict_batch(X)[0], expected.predict_batch(X)[0])
+
+
+def test_simulate_signals_holds_for_the_horizon_and_charges_fees_on_changes():
+    prices = np.array([[100.0], [110.0], [99.0], [99.0], [120.0]])
+    # BUY, SELL, HOLD (no edge), then no prediction
+    predictions = np.array([[120.0], [100.0], [99.0], [np.nan], [np.nan]])
+
+    report = simulate_signals(predictions, prices, np.array(['Bond']), horizon=2, fee_bps=100,
+                              threshold_percent=0)['overall']
+
+    # Half-size sleeves held two steps: +1 x (99/100 - 1) / 2 and -1 x (99/110 - 1) / 2
+    assert report['gross_pnl'] == pytest.approx((-0.01 + 0.1) / 2)
+    # Sleeve changes |s_t - s_t-2| / 2: 0.5 + 0.5 + 0.5 + 0.5
+    assert report['turnover'] == pytest.approx(2.0)
+    assert report['fees'] == pytest.approx(2.0 * 0.01)
+    assert report['net_pnl'] == pytest.approx(0.045 - 0.02)
+    # The BUY at 100 saw 99 two steps later, the SELL at 110 saw 99
+    assert report['hit_rate'] == 0.5
+    assert (report['buy_signals'], report['sell_signals']) == (1, 1)
+
+
+def test_one_step_horizon_matches_step_returns():
+    prices = np.array([[100.0], [105.0], [102.0], [110.0]])
+    predictions = np.array([[110.0], [90.0], [120.0], [np.nan]])
+
+    report = simulate_signals(predictions, prices, np.array(['Bond']), horizon=1, fee_bps=0,
+                              threshold_percent=1)['overall']
+
+    assert report['gross_pnl'] == pytest.approx(0.05 - (102 / 105 - 1) + (110 / 102 - 1), abs=1e-6)
+    assert report['turnover'] == pytest.approx(1 + 2 + 2 + 1)
+
+
+def test_run_backtest_covers_every_test_step():
+    features, prices = _panel(60, 8)
+    history = PriceHistory(features, prices, np.array(['Bond', 'Invoice'] * 4), [f"0x{i}" for i in range(8)])
+
+    report = run_backtest(history, train_window=20, test_window=10, horizon=2, n_jobs=2)
+
+    assert report['windows'] == 4
+    evaluated = report['overall']['buy_signals'] + report['overall']['sell_signals']
+    assert 0 < evaluated <= (60 - 20 - 2) * 8
+    assert set(report['by_asset_type']) == {'Bond', 'Invoice'}
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from models.compact_forest import CompactForest, compact_forest
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1500, 25))
+    y = 3 * X[:, 0] + X[:, 1] ** 2 + rng.normal(size=1500)
+    forest = RandomForestRegressor(n_estimators=40, max_depth=10, random_state=0).fit(X, y)
+    return forest, rng
+
+
+def test_matches_sklearn_on_fresh_rows(fitted):
+    forest, rng = fitted
+    X = rng.normal(size=(3000, 25))
+    compact = CompactForest.from_forest(forest)
+
+    np.testing.assert_allclose(compact.predict(X), forest.predict(X), rtol=1e-5, atol=1e-4)
+
+
+def test_matches_sklearn_on_split_thresholds(fitted):
+    """Inputs sitting exactly on (float32-rounded) thresholds must take the same branch"""
+    forest, rng = fitted
+    compact = CompactForest.from_forest(forest)
+
+    rows = []
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        for feature, threshold in zip(tree.feature, tree.threshold):
+            if feature >= 0:
+                row = rng.normal(size=25)
+                row[feature] = np.float32(threshold)
+                rows.append(row)
+    X = np.array(rows)
+
+    np.testing.assert_allclose(compact.predict(X), forest.predict(X), rtol=1e-5, atol=1e-4)
+
+
+def test_per_tree_predictions_match(fitted):
+    forest, rng = fitted
+    X = rng.normal(size=(200, 25))
+    expected = np.column_stack([tree.predict(X) for tree in forest.estimators_])
+
+    np.testing.assert_allclose(CompactForest.from_forest(forest).predict_trees(X), expected, rtol=1e-5, atol=1e-4)
+
+
+def test_arrays_round_trip(fitted):
+    forest, rng = fitted
+    X = rng.normal(size=(100, 25))
+    compact = CompactForest.from_forest(forest)
+
+    np.testing.assert_array_equal(CompactForest.from_arrays(compact.to_arrays()).predict(X), compact.predict(X))
+
+
+def test_select_trees_keeps_chosen_trees(fitted):
+    forest, rng = fitted
+    X = rng.normal(size=(100, 25))
+    compact = CompactForest.from_forest(forest)
+    keep = [3, 0, 17]
+
+    np.testing.assert_array_equal(compact.select_trees(keep).predict_trees(X), compact.predict_trees(X)[:, keep])
+
+
+def test_compact_without_pruning_keeps_every_tree(fitted):
+    forest, _ = fitted
+    compact, report = compact_forest(forest)
+
+    assert compact.n_trees == forest.n_estimators
+    assert report['compact_trees'] == report['original_trees']
+
+
+def test_pruning_selects_on_prune_split_only(fitted):
+    forest, rng = fitted
+    X_val = rng.normal(size=(300, 25))
+    y_val = 3 * X_val[:, 0] + X_val[:, 1] ** 2
+
+    # A validation split alone must never drive tree selection
+    unpruned, _ = compact_forest(forest, X_val, y_val, prune_tolerance=0.05, min_trees=5)
+    assert unpruned.n_trees == forest.n_estimators
+
+    X_prune = rng.normal(size=(300, 25))
+    y_prune = 3 * X_prune[:, 0] + X_prune[:, 1] ** 2
+    pruned, report = compact_forest(forest, X_val, y_val, prune_tolerance=0.05, min_trees=5,
+                                    X_prune=X_prune, y_prune=y_prune)
+
+    assert 5 <= pruned.n_trees <= forest.n_estimators
+    assert report['prune_samples'] == 300
+    assert report['compact_val_rmse'] == pytest.approx(np.sqrt(np.mean((pruned.predict(X_val) - y_val) ** 2)))
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from scipy.stats import ks_2samp
+
+from models.drift_monitor import DriftMonitor, build_reference_snapshot, ks_statistic, population_stability_index
+
+
+def test_psi_of_identical_proportions_is_zero():
+    proportions = np.array([[0.1, 0.2, 0.3, 0.4]])
+    assert population_stability_index(proportions, proportions) == pytest.approx([0.0])
+
+
+def test_psi_matches_closed_form():
+    expected = np.array([[0.5, 0.5], [0.2, 0.8]])
+    actual = np.array([[0.25, 0.75], [0.2, 0.8]])
+    psi = population_stability_index(expected, actual)
+
+    assert psi[0] == pytest.approx(-0.25 * np.log(0.5) + 0.25 * np.log(1.5))
+    assert psi[1] == pytest.approx(0.0)
+
+
+def test_psi_stays_finite_for_empty_bins():
+    psi = population_stability_index(np.array([[0.5, 0.5, 0.0]]), np.array([[0.0, 0.5, 0.5]]))
+    assert np.isfinite(psi).all() and psi[0] > 1
+
+
+def test_ks_matches_scipy():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(size=(500, 3))
+    live = np.column_stack([rng.normal(size=300), rng.normal(0.5, 1, size=300), rng.exponential(size=300)])
+
+    expected = [ks_2samp(reference[:, i], live[:, i]).statistic for i in range(3)]
+    np.testing.assert_allclose(ks_statistic(reference, live), expected)
+
+
+def test_ks_of_disjoint_samples_is_one():
+    assert ks_statistic(np.zeros((10, 1)), np.ones((10, 1)))[0] == pytest.approx(1.0)
+
+
+def test_monitor_flags_only_shifted_monitored_features():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(5000, 3))
+    monitor = DriftMonitor("test", reservoir_size=500)
+    monitor.set_reference(build_reference_snapshot(X, ["stable", "shifted", "clock"], n_bins=10,
+                                                   sample_size=1000, exclude_features=["clock"]))
+
+    live = rng.normal(size=(1000, 3))
+    live[:, 1] += 1.0
+    live[:, 2] += 5.0
+    for row in live:
+        monitor.observe(row)
+    report = monitor.check(min_samples=100)
+
+    assert report['observations'] == 1000
+    assert report['drifted_features'] == ["shifted"]
+    assert report['features']['stable']['psi'] < 0.1
+    assert report['features']['clock']['ks'] > 0.9
+
+
+def test_check_waits_for_min_samples():
+    rng = np.random.default_rng(2)
+    monitor = DriftMonitor("test")
+    monitor.set_reference(build_reference_snapshot(rng.normal(size=(500, 2)), ["a", "b"]))
+    monitor.observe(np.zeros(2))
+
+    assert monitor.check(min_samples=10) is None
+
+
+def test_features_the_api_cannot_supply_are_not_flagged():
+    from models.price_predictor import RWAPricePredictor
+
+    rng = np.random.default_rng(3)
+
+    def record():
+        price = float(rng.uniform(50, 150))
+        return {'asset_type': 'Bond', 'current_price': price, 'total_asset_value': price * 1e4,
+                'yield_rate': float(rng.uniform(0, 1000)), 'liquidity_depth': float(rng.uniform(1e3, 1e5)),
+                'rsi': float(rng.uniform(20, 80)), 'trading_pairs_count': int(rng.integers(1, 5)),
+                'time_since_launch_days': int(rng.integers(1, 900)), 'target_price': price * 1.01}
+
+    predictor = RWAPricePredictor(n_estimators=5, max_depth=3, n_jobs=1)
+    predictor.train([record() for _ in range(300)], n_jobs=1)
+    monitor = DriftMonitor("test", reservoir_size=200)
+    monitor.set_reference(predictor.drift_snapshot)
+
+    # Live requests only carry AssetData fields; the rest fall back to prepare_features defaults
+    for _ in range(200):
+        served = {key: value for key, value in record().items()
+                  if key not in RWAPricePredictor.UNSERVED_FEATURES}
+        monitor.observe(predictor.prepare_features(served))
+    report = monitor.check(min_samples=100)
+
+    assert not set(report['drifted_features']) & set(RWAPricePredictor.UNSERVED_FEATURES)
+    assert report['features']['liquidity_depth']['ks'] > 0.9
@@ -0,0 +1,64 @@
+import time
+from collections import Counter
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from instrumentation import SlowRequestLog, SlowRequestMiddleware, format_collapsed, run_in_executor, stage
+
+
+def slow_work(seconds: float) -> str:
+    with stage("work"):
+        time.sleep(seconds)
+    return "done"
+
+
+def _client(log: SlowRequestLog, threshold_ms: float) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(SlowRequestMiddleware, log=log, threshold_ms=threshold_ms)
+
+    @app.post("/work")
+    async def work(payload: dict):
+        with stage("handler"):
+            return {"result": await run_in_executor(slow_work, payload["seconds"])}
+
+    return TestClient(app)
+
+
+def test_captures_stages_and_stacks_from_executor_threads():
+    log = SlowRequestLog(buffer_size=5)
+    response = _client(log, threshold_ms=50).post("/work?verbose=1", json={"seconds": 0.2})
+    assert response.status_code == 200
+
+    [capture] = log.recent()
+    assert (capture['method'], capture['path'], capture['query_string']) == ("POST", "/work", "verbose=1")
+    assert capture['status_code'] == 200
+    assert capture['input'] == {"seconds": 0.2}
+    assert capture['stage_timings_ms']['work'] >= 200
+    assert capture['stage_timings_ms']['handler'] >= capture['stage_timings_ms']['work']
+    assert any(stack.endswith("test_instrumentation.py:slow_work") for stack in capture['stack_samples'])
+
+
+def test_fast_requests_are_not_captured():
+    log = SlowRequestLog(buffer_size=5)
+    _client(log, threshold_ms=1000).post("/work", json={"seconds": 0})
+    assert log.recent() == []
+
+
+def test_stage_outside_a_request_is_a_no_op():
+    with stage("anything"):
+        pass
+
+
+def test_log_keeps_only_the_newest_captures():
+    log = SlowRequestLog(buffer_size=3)
+    for i in range(5):
+        log.append({'id': i})
+
+    assert [capture['id'] for capture in log.recent()] == [4, 3, 2]
+    assert [capture['id'] for capture in log.recent(limit=2)] == [4, 3]
+
+
+def test_format_collapsed_orders_stacks_by_count():
+    samples = Counter({"main;a": 2, "main;b": 5, "main;c": 1})
+    assert format_collapsed(samples) == "main;b 5\nmain;a 2\nmain;c 1"
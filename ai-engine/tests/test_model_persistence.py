@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+
+from models.price_predictor import RWAPricePredictor
+
+
+def _fitted_predictor(seed: int) -> RWAPricePredictor:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(400, 25))
+    predictor = RWAPricePredictor(n_estimators=10, max_depth=6, n_jobs=1)
+    predictor.fit(X, X[:, 0] * (seed + 1) + 100)
+    return predictor
+
+
+def test_overwriting_a_memory_mapped_model_keeps_the_loaded_copy_valid(tmp_path):
+    path = str(tmp_path / "price_predictor.joblib")
+    _fitted_predictor(0).save_model(path)
+
+    loaded = RWAPricePredictor()
+    loaded.load_model(path)
+    X = np.random.default_rng(1).normal(size=(50, 25))
+    before, _ = loaded.predict_batch(X)
+
+    # Saving a different model over the mapped file must not touch the pages already mapped
+    _fitted_predictor(1).save_model(path)
+    after, _ = loaded.predict_batch(X)
+
+    np.testing.assert_array_equal(before, after)
+    assert os.listdir(tmp_path) == ["price_predictor.joblib"]
+
+
+def test_compact_round_trip_matches_in_memory_forest(tmp_path):
+    path = str(tmp_path / "price_predictor.joblib")
+    predictor = _fitted_predictor(0)
+    X = np.random.default_rng(2).normal(size=(50, 25))
+    expected, _ = predictor.predict_batch(X)
+
+    predictor.save_model(path)
+    loaded = RWAPricePredictor()
+    loaded.load_model(path)
+
+    np.testing.assert_allclose(loaded.predict_batch(X)[0], expected, rtol=1e-5)
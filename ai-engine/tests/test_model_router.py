@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pytest
+
+from models.model_router import ModelRouter
+from models.price_predictor import RWAPricePredictor
+
+
+def _records(rng, asset_type: str, n: int, horizons=('24h',)) -> list:
+    records = []
+    for _ in range(n):
+        price = float(rng.uniform(50, 150))
+        record = {'asset_type': asset_type, 'current_price': price, 'total_asset_value': price * 1e4,
+                  'yield_rate': float(rng.uniform(0, 1000))}
+        for horizon in horizons:
+            record[f"target_price_{horizon}"] = price * 1.01
+        records.append(record)
+    return records
+
+
+def _save_route(router: ModelRouter, asset_type: str, horizon: str, offset: float) -> None:
+    X = np.random.default_rng(0).normal(size=(100, 25))
+    predictor = RWAPricePredictor(n_estimators=5, max_depth=3, n_jobs=1)
+    predictor.fit(X, X[:, 0] + offset)
+    predictor.save_model(router.model_path(asset_type, horizon))
+
+
+def test_cache_evicts_least_recently_used_route(tmp_path):
+    router = ModelRouter(models_dir=str(tmp_path), cache_size=2)
+    for i, asset_type in enumerate(['RealEstate', 'Bond', 'Invoice']):
+        _save_route(router, asset_type, '24h', i)
+    router.refresh_routes()
+
+    real_estate = router.get_model('RealEstate', '24h')
+    router.get_model('Bond', '24h')
+    assert router.get_model('RealEstate', '24h') is real_estate
+    router.get_model('Invoice', '24h')
+
+    assert list(router._cache) == [('RealEstate', '24h'), ('Invoice', '24h')]
+    assert (router.cache_hits, router.cache_misses) == (1, 3)
+
+
+def test_retraining_removes_routes_that_were_not_retrained(tmp_path):
+    rng = np.random.default_rng(0)
+    router = ModelRouter(models_dir=str(tmp_path))
+    router.train(_records(rng, 'Bond', 100, horizons=('24h', '7d')), n_jobs=1)
+    assert router.has_route('Bond', '7d')
+
+    result = router.train(_records(rng, 'Bond', 100), n_jobs=1)
+
+    assert result['routes_removed'] == ['Bond/7d']
+    assert router.available_routes() == [('Bond', '24h')]
+    assert not os.path.exists(router.model_path('Bond', '7d'))
+
+
+def test_unknown_routes_never_touch_the_filesystem(tmp_path):
+    router = ModelRouter(models_dir=str(tmp_path / "router"))
+    (tmp_path / "x_24h.joblib").write_bytes(b"not a model")
+
+    assert not router.has_route('../x', '24h')
+    with pytest.raises(KeyError):
+        router.get_model('../x', '24h')
+    with pytest.raises(ValueError):
+        router.model_path('Bond', '../../24h')
+
+
+def test_predict_price_returns_404_for_a_missing_horizon_route(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.setattr(main, "model_router", ModelRouter(models_dir=str(tmp_path)))
+    client = TestClient(main.app)
+    asset = {'token_address': '0x1', 'name': 'Bond', 'symbol': 'BND', 'asset_type': 'Bond',
+             'total_asset_value': 1e6, 'current_price': 100}
+    headers = {'Authorization': f"Bearer {main.settings.API_KEY}"}
+
+    for horizon in ['1h', '7d']:
+        response = client.post(f"/api/ai/predict-price?horizon={horizon}", json=asset, headers=headers)
+        assert response.status_code == 404
+
+    response = client.post("/api/ai/predict-price", json=asset, headers=headers)
+    assert response.status_code == 200
+    assert response.json()['model'] in ('heuristic', 'general')
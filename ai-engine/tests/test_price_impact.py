@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from models.price_impact import constant_product_impact, quote_grid
+
+
+def _brute_force_max_amount_in(reserve_in: float, reserve_out: float, fee_bps: float, max_slippage: float) -> float:
+    """Largest amount on a fine geometric grid whose execution stays within max_slippage"""
+    amounts = np.geomspace(reserve_in * 1e-9, reserve_in * 10, 200001)
+    fee = fee_bps / 10000
+    after_fee = amounts * (1 - fee)
+    execution_price = reserve_out * after_fee / (reserve_in + after_fee) / amounts
+    within = 1 - execution_price / (reserve_out / reserve_in) <= max_slippage
+    return float(amounts[within].max()) if within.any() else 0.0
+
+
+@pytest.mark.parametrize("fee_bps,max_slippage", [(30, 0.01), (30, 0.05), (0, 0.02), (100, 0.005)])
+def test_max_amount_in_matches_brute_force(fee_bps, max_slippage):
+    reserve_in = np.array([1e3, 2.5e5, 7e6])
+    reserve_out = np.array([5e4, 1e5, 3e6])
+    impact = constant_product_impact(reserve_in, reserve_out, np.array([1.0]), fee_bps, max_slippage)
+
+    for i in range(len(reserve_in)):
+        expected = _brute_force_max_amount_in(reserve_in[i], reserve_out[i], fee_bps, max_slippage)
+        assert impact['max_amount_in'][i] == pytest.approx(expected, rel=1e-3, abs=1e-9)
+
+
+def test_max_amount_in_sits_exactly_at_the_slippage_limit():
+    reserve_in, reserve_out = np.array([4e5]), np.array([9e4])
+    max_amount = constant_product_impact(reserve_in, reserve_out, np.array([1.0]), 30, 0.02)['max_amount_in']
+
+    at_limit = constant_product_impact(reserve_in, reserve_out, max_amount, 30, 0.02)
+    assert at_limit['slippage'][0, 0] == pytest.approx(0.02, rel=1e-9)
+
+
+def test_fee_above_slippage_limit_allows_no_trade():
+    impact = constant_product_impact(np.array([1e6]), np.array([1e6]), np.array([1.0]), fee_bps=100, max_slippage=0.005)
+    assert impact['max_amount_in'][0] == 0.0
+
+
+def test_empty_pools_give_nan_quotes():
+    impact = constant_product_impact(np.array([0.0, 1e6]), np.array([1e6, 1e6]), np.array([10.0, 100.0]), 30, 0.01)
+
+    assert np.isnan(impact['slippage'][0]).all()
+    assert impact['max_amount_in'][0] == 0.0
+    assert np.isfinite(impact['slippage'][1]).all()
+
+
+def test_buy_and_sell_prices_are_usdc_per_token():
+    # reserve0 = RWA tokens, reserve1 = USDC: spot is 2 USDC per token either way
+    reserve0, reserve1 = np.array([1e6]), np.array([2e6])
+    buy = quote_grid(reserve0, reserve1, np.array([1000.0]), side='buy', fee_bps=0)
+    sell = quote_grid(reserve0, reserve1, np.array([1000.0]), side='sell', fee_bps=0)
+
+    assert buy['spot_price'][0] == pytest.approx(2.0)
+    assert sell['spot_price'][0] == pytest.approx(2.0)
+    assert buy['execution_price'][0, 0] > 2.0 > sell['execution_price'][0, 0]
+
+
+def test_price_impact_request_size_is_bounded():
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    headers = {'Authorization': f"Bearer {main.settings.API_KEY}"}
+    pool = {'token_address': '0x1', 'reserve0': 1e6, 'reserve1': 2e6}
+
+    def post(n_pools: int, n_sizes: int) -> int:
+        body = {'pools': [pool] * n_pools, 'trade_sizes': [100.0] * n_sizes}
+        return client.post("/api/ai/price-impact", json=body, headers=headers).status_code
+
+    assert post(1, main.settings.AMM_MAX_TRADE_SIZES) == 200
+    assert post(1, main.settings.AMM_MAX_TRADE_SIZES + 1) == 422
+    assert post(main.settings.AMM_MAX_POOLS + 1, 1) == 422
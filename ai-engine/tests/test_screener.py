@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from models.screener import RiskScreener
+
+ASSET_TYPES = ['RealEstate', 'Bond', 'Invoice', 'Commodity']
+JURISDICTIONS = ['US', 'EU', 'SG']
+CATEGORIES = ['Low', 'Medium', 'High']
+
+
+def _asset(rng, token: str) -> dict:
+    return {
+        'token_address': token,
+        'name': token,
+        'symbol': token[-3:],
+        'asset_type': str(rng.choice(ASSET_TYPES)),
+        'jurisdiction': str(rng.choice(JURISDICTIONS)),
+        'yield_rate': float(rng.integers(0, 1500)),
+        'current_price': float(rng.uniform(1, 200)),
+        'market_cap': float(rng.uniform(1e4, 1e7)),
+        'total_liquidity': float(rng.uniform(0, 1e6)),
+        'volume_24h': float(rng.uniform(0, 1e5)),
+    }
+
+
+def _analysis(rng) -> dict:
+    # Rounded like RiskScorer output so ties occur
+    return {'overall_risk_score': round(float(rng.uniform(0, 100)), 1), 'risk_category': str(rng.choice(CATEGORIES))}
+
+
+def _brute_force(rows: dict, asset_types=None, jurisdictions=None, risk_categories=None, min_risk_score=None,
+                 max_risk_score=None, min_yield_rate=None, max_yield_rate=None, sort_by='risk_score',
+                 descending=False, limit=50):
+    matches = [
+        row for row in rows.values()
+        if (asset_types is None or row['asset_type'] in asset_types)
+        and (jurisdictions is None or row['jurisdiction'] in jurisdictions)
+        and (risk_categories is None or row['risk_category'] in risk_categories)
+        and (min_risk_score is None or row['risk_score'] >= min_risk_score)
+        and (max_risk_score is None or row['risk_score'] <= max_risk_score)
+        and (min_yield_rate is None or row['yield_rate'] >= min_yield_rate)
+        and (max_yield_rate is None or row['yield_rate'] <= max_yield_rate)
+    ]
+    return sorted(matches, key=lambda row: row[sort_by], reverse=descending)[:limit]
+
+
+def _random_query(rng) -> dict:
+    query = {'sort_by': str(rng.choice(['risk_score', 'yield_rate', 'market_cap'])),
+             'descending': bool(rng.integers(2)), 'limit': int(rng.integers(1, 40))}
+    if rng.random() < 0.5:
+        query['asset_types'] = list(rng.choice(ASSET_TYPES, size=2, replace=False))
+    if rng.random() < 0.3:
+        query['jurisdictions'] = [str(rng.choice(JURISDICTIONS))]
+    if rng.random() < 0.3:
+        query['risk_categories'] = [str(rng.choice(CATEGORIES))]
+    if rng.random() < 0.5:
+        low = float(rng.uniform(0, 60))
+        query['min_risk_score'], query['max_risk_score'] = low, low + float(rng.uniform(5, 50))
+    if rng.random() < 0.5:
+        query['min_yield_rate'] = float(rng.integers(0, 1000))
+    if rng.random() < 0.3:
+        query['max_yield_rate'] = float(rng.integers(500, 1500))
+    return query
+
+
+def _assert_same(result, expected, query):
+    sort_by = query.get('sort_by', 'risk_score')
+    # Equal sort keys may come back in any order, so compare keys and membership
+    assert [row[sort_by] for row in result] == [row[sort_by] for row in expected]
+    expected_keys = {row[sort_by] for row in expected}
+    if len(expected) < query.get('limit', 50):
+        assert {row['token_address'] for row in result} == {row['token_address'] for row in expected}
+    else:
+        assert all(row[sort_by] in expected_keys for row in result)
+
+
+def test_query_matches_brute_force_under_interleaved_writes():
+    rng = np.random.default_rng(0)
+    screener = RiskScreener(initial_capacity=8)
+    rows = {}
+
+    def record(token):
+        asset, analysis = _asset(rng, token), _analysis(rng)
+        screener.record(asset, analysis)
+        rows[token] = {**asset, 'risk_score': analysis['overall_risk_score'], 'risk_category': analysis['risk_category']}
+
+    for i in range(300):
+        record(f"0x{i:04x}")
+
+    for step in range(400):
+        action = rng.random()
+        if action < 0.3:
+            record(f"0x{int(rng.integers(0, 400)):04x}")
+        elif action < 0.4 and rows:
+            token = str(rng.choice(sorted(rows)))
+            assert screener.remove(token)
+            del rows[token]
+        query = _random_query(rng)
+        _assert_same(screener.query(**query), _brute_force(rows, **query), query)
+
+    assert len(screener) == len(rows)
+
+
+def test_bulk_upsert_then_query_matches_brute_force():
+    rng = np.random.default_rng(1)
+    screener = RiskScreener()
+    assets = [_asset(rng, f"0x{i:04x}") for i in range(500)]
+    screener.upsert(assets)
+    screener.query()  # build indexes before the next batch
+
+    changed = [{**asset, 'yield_rate': float(rng.integers(0, 1500))} for asset in assets[:200]]
+    result = screener.upsert(changed)
+    assert result['updated'] == 200
+
+    rows = {row['token_address']: row for row in screener.query(limit=1000)}
+    for query in [_random_query(rng) for _ in range(50)]:
+        _assert_same(screener.query(**query), _brute_force(rows, **query), query)
+
+
+def test_unknown_sort_column_is_rejected():
+    with pytest.raises(ValueError):
+        RiskScreener().query(sort_by='name')
+
+
+def test_failed_risk_scorings_are_not_screened():
+    rng = np.random.default_rng(2)
+    screener = RiskScreener()
+    good, broken = _asset(rng, "0x0001"), {**_asset(rng, "0x0002"), 'volume_24h': None}
+
+    result = screener.upsert([good, broken])
+    assert (result['updated'], result['failed'], result['unchanged']) == (1, 1, 0)
+
+    screener.record(_asset(rng, "0x0003"), {'overall_risk_score': 50.0, 'risk_category': 'Medium', 'error': 'boom'})
+    assert [row['token_address'] for row in screener.query()] == ["0x0001"]
+
+    # A later failure keeps the earlier score and is retried on the next upsert
+    result = screener.upsert([{**good, 'volume_24h': None}])
+    assert (result['updated'], result['failed']) == (0, 1)
+    assert len(screener) == 1
@@ -0,0 +1,47 @@
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from models.price_predictor import RWAPricePredictor
+from models.shared_inference import SharedMemoryInference
+
+
+@pytest.fixture
+def saved_model(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 25))
+    predictor = RWAPricePredictor(n_estimators=20, max_depth=6, n_jobs=1)
+    predictor.fit(X, 2 * X[:, 0] + 100)
+    path = str(tmp_path / "price_predictor.joblib")
+    predictor.save_model(path)
+    predictor.load_model(path)
+    return predictor, path, rng.normal(size=(700, 25))
+
+
+def test_pool_matches_in_process_scoring(saved_model):
+    predictor, path, X = saved_model
+    pool = SharedMemoryInference(path, n_workers=2, chunk_rows=128)
+    try:
+        results = pool.predict(X)
+    finally:
+        pool.close()
+
+    predicted, confidence, variance = predictor.predict_batch(X, return_variance=True)
+    np.testing.assert_allclose(results['predicted_price'], predicted)
+    np.testing.assert_allclose(results['confidence'], confidence)
+    np.testing.assert_allclose(results['variance'], variance)
+
+
+def test_pool_recovers_from_dead_workers(saved_model):
+    predictor, path, X = saved_model
+    pool = SharedMemoryInference(path, n_workers=2, chunk_rows=128)
+    try:
+        expected = pool.predict(X)['predicted_price']
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+
+        np.testing.assert_allclose(pool.predict(X)['predicted_price'], expected)
+    finally:
+        pool.close()
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_importing_main_does_not_load_sklearn():
+    code = "import sys, main; sys.exit('sklearn' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], cwd=ENGINE_DIR).returncode == 0
+
+
+def test_ready_only_after_saved_models_finish_loading(monkeypatch):
+    import main
+
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_load():
+        loading.set()
+        release.wait(timeout=10)
+        main.startup_state["models_loaded"].append("price_predictor")
+
+    monkeypatch.setattr(main, "startup_state", {"ready": False, "models_loaded": [], "error": None})
+    monkeypatch.setattr(main, "load_saved_models", slow_load)
+
+    with TestClient(main.app) as client:
+        assert loading.wait(timeout=10)
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+        # Liveness answers while loading
+        assert client.get("/health").status_code == 200
+
+        release.set()
+        deadline = time.monotonic() + 10
+        while client.get("/health/ready").status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["models_loaded"] == ["price_predictor"]
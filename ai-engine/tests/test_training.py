@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from sklearn.model_selection import KFold, cross_validate
+
+from config import settings
+from models.price_predictor import RWAPricePredictor
+
+
+@pytest.fixture(autouse=True)
+def sequential_training(monkeypatch):
+    monkeypatch.setattr(settings, "TRAIN_N_WORKERS", 1)
+    monkeypatch.setattr(settings, "TRAIN_THREADS_PER_WORKER", 1)
+    monkeypatch.setattr(settings, "MODEL_PRUNE_TOLERANCE", 0.0)
+
+
+def _records(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(n):
+        price = float(rng.uniform(50, 150))
+        yield_rate = float(rng.uniform(0, 1000))
+        records.append({'asset_type': 'Bond', 'current_price': price, 'total_asset_value': price * 1e4,
+                        'yield_rate': yield_rate, 'target_price': price * (1 + yield_rate / 1e4)})
+    return records
+
+
+def test_parallel_budget_splits_cores_between_workers_and_threads(monkeypatch):
+    predictor = RWAPricePredictor()
+    monkeypatch.setattr("models.price_predictor.os.cpu_count", lambda: 8)
+    monkeypatch.setattr(settings, "TRAIN_N_WORKERS", 8)
+    monkeypatch.setattr(settings, "TRAIN_THREADS_PER_WORKER", 3)
+
+    assert predictor._parallel_budget() == (2, 3)
+    assert predictor._parallel_budget(n_jobs=5) == (5, 1)
+    assert predictor._parallel_budget(n_jobs=0) == (1, 1)
+
+    monkeypatch.setattr(settings, "TRAIN_THREADS_PER_WORKER", 16)
+    assert predictor._parallel_budget() == (1, 8)
+
+
+def test_each_cv_fold_fits_its_own_scaler():
+    rng = np.random.default_rng(0)
+    X = rng.normal(loc=rng.uniform(-5, 5, size=4), size=(100, 4))
+    y = X[:, 0]
+    predictor = RWAPricePredictor(n_estimators=5, max_depth=3, n_jobs=1)
+    predictor.model = predictor._new_forest()
+
+    folds = KFold(n_splits=4)
+    results = cross_validate(predictor._build_pipeline(2), X, y, cv=folds, return_estimator=True)
+
+    for pipeline, (train_rows, _) in zip(results['estimator'], folds.split(X)):
+        np.testing.assert_allclose(pipeline.named_steps['scaler'].mean_, X[train_rows].mean(axis=0))
+        assert pipeline.named_steps['model'].n_jobs == 2
+    assert predictor.model.n_jobs == 1
+
+
+def test_tune_hyperparameters_ranks_the_survivors_first():
+    training = _records(300)
+    predictor = RWAPricePredictor(n_jobs=1)
+    predictor.model = predictor._new_forest()
+    X, y = predictor.build_training_matrix(training)
+    grid = {'n_estimators': [5, 10], 'max_depth': [2, 4, 6]}
+
+    result = predictor.tune_hyperparameters(X, y, param_grid=grid)
+
+    assert result['n_candidates'] == 6
+    assert result['candidates'][0]['params'] == result['best_params']
+    assert result['candidates'][0]['rounds'] == result['n_rounds']
+    assert result['halving_n_resources'] <= len(X)
+    assert all(c['params']['max_depth'] in grid['max_depth'] for c in result['candidates'])
+
+
+def test_tuned_cv_score_is_full_data_and_params_do_not_leak(monkeypatch):
+    training = _records(200)
+    monkeypatch.setattr(RWAPricePredictor, "DEFAULT_PARAM_GRID", {'max_depth': [2]})
+
+    predictor = RWAPricePredictor(n_estimators=10, max_depth=8, n_jobs=1)
+    tuned = predictor.train(training, tune=True)
+    assert predictor.model.max_depth == 2
+
+    # Same full-split CV as an untuned model built with the chosen params
+    reference = RWAPricePredictor(n_estimators=10, max_depth=2, n_jobs=1).train(training)
+    assert tuned['cv_rmse'] == pytest.approx(reference['cv_rmse'])
+    assert 'halving_cv_rmse' in tuned['hyperparameter_search']
+
+    predictor.train(training)
+    assert predictor.model.max_depth == 8